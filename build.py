@@ -2,8 +2,43 @@ import os
 import shutil
 import re
 import sys
+import json
+import hashlib
+import argparse
+import importlib.util
+import time
+from contextlib import contextmanager
+from urllib.parse import unquote
+import gzip
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from PIL import Image, features as pil_features
+except ImportError:
+    Image = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+# File placement and sync helpers live with the deck generator, which uses them on its own.
+# Loaded by path: putting the generator's scripts/ on sys.path would shadow same-named
+# modules (validate_presentation.py) for every program that imports build.
+FILE_SYNC_PATH = Path(__file__).resolve().parent / "skills" / "creating-html-presentation" / "scripts" / "file_sync.py"
+file_sync = sys.modules.get("file_sync")
+if file_sync is None:
+    _spec = importlib.util.spec_from_file_location("file_sync", FILE_SYNC_PATH)
+    file_sync = sys.modules["file_sync"] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(file_sync)
+from file_sync import MATERIALIZE_STRATEGIES, file_digest, materialize, remove_empty_parents
+
 # --- Configuration ---
 PROJECT_ROOT = Path(os.getcwd())
 DIST_ROOT = PROJECT_ROOT / "dist"
@@ -15,6 +50,66 @@ GLOBAL_IMAGES = PROJECT_ROOT / "images"
 SKIP_EXTENSIONS = {'.mp4', '.webm', '.mov', '.avi'}
 MAX_FILE_SIZE = 1024 * 1024  # 1MB limit for individual assets in dist
 
+# Incremental build manifest (lives inside dist so it travels with the outputs it describes)
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 1
+# Bump when the lesson HTML rewrite rules change so every index.html is regenerated
+HTML_TRANSFORM_VERSION = "4"
+ENGINE_FOLDERS = ('dist', 'plugin', 'css')
+# Shared styles of generated decks (was inline in every index.html), served as css/deck.css
+DECK_STYLESHEET = PROJECT_ROOT / "skills" / "creating-html-presentation" / "css" / "deck.css"
+# <youtube-facade>, shared by generated decks and slide-components.js, served as js/youtube-facade.js
+FACADE_SCRIPT = PROJECT_ROOT / "js" / "youtube-facade.js"
+# Library-level folders of dist/ that lessons reference as ../<folder>/...
+SHARED_FOLDERS = ('dist', 'plugin', 'css', 'images', 'js')
+
+# Content-addressed store for lesson assets shared across decks (dist/_assets/<hash><ext>)
+ASSET_STORE = "_assets"
+ASSET_HASH_LEN = 16
+# References from a lesson to library-level files: ../dist/reveal.css, ../images/bg.jpg, ...
+SHARED_REF_RE = re.compile(r'''(?P<pre>["'(])\.\./(?P<path>(?:''' + '|'.join(SHARED_FOLDERS) + r''')/[^"'()?#<>]+)''')
+# Shared files that get an immutable, content-hashed twin (reveal.css -> reveal.1a2b3c4d5e.css)
+FINGERPRINT_EXTENSIONS = {'.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.avif',
+                          '.mp3', '.wav', '.m4a', '.woff', '.woff2', '.ttf'}
+FINGERPRINT_LEN = 10
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+# Responsive image variants (projector-relevant widths), cached by source hash
+IMAGE_CACHE = PROJECT_ROOT / ".cache" / "images"
+IMAGE_WIDTHS = (960, 1280, 1920)
+# Encoder settings per format, best first (AVIF speed 8 keeps cold builds tolerable)
+IMAGE_ENCODE_OPTIONS = {'avif': {'quality': 55, 'speed': 8}, 'webp': {'quality': 80, 'method': 4}}
+RASTER_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tif', '.tiff'}
+IMAGE_PIPELINE_VERSION = "1"
+# Precompressed sidecars (reveal.js -> reveal.js.gz / reveal.js.br) served by Caddy's `precompressed`
+COMPRESS_EXTENSIONS = {'.html', '.css', '.js', '.mjs', '.json', '.svg', '.txt', '.xml', '.map',
+                       '.ttf', '.otf', '.eot', '.ico', '.wasm'}
+COMPRESS_MIN_SIZE = 1024         # Below this the headers outweigh the savings
+COMPRESS_MIN_SAVING = 0.10       # Sidecar must be at least 10% smaller than the original
+SIDECAR_ENCODINGS = {'.gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+                     '.br': lambda data: brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)}
+IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+BACKGROUND_REF_RE = re.compile(r'''(?P<attr>data-background(?:-image)?=|<link rel="preload" as="image" href=)(?P<q>["'])(?:\./)?(?P<path>images/[^"']+)(?P=q)''')
+# Relative asset references inside lesson HTML: attribute values, srcset lists, JS strings and CSS url()
+ASSET_REF_RE = re.compile(r'''(?P<pre>["'(]|,\s*)(?:\./)?(?P<path>(?:images|audio)/[^"'()?#<>,]+?)(?=["'()?#<>,]|\s+\d+(?:\.\d+)?[wx]\b)''')
+SCRIPT_SRC_RE = re.compile(r'''<script\b[^>]*\bsrc=["'](?P<src>[^"']+)["']''', re.IGNORECASE)
+# Custom elements whose sounds are only named inside slide-components.js
+COMPONENT_SCRIPT = PROJECT_ROOT / "js" / "slide-components.js"
+COMPONENT_TAGS = ('<timer-pill',)
+# Font Awesome served locally: with the fontawesome-free package unpacked in lib/fontawesome
+# (css/all.min.css + webfonts/), a deck's CDN stylesheet link is replaced by a stylesheet
+# holding only the icons the deck uses. Fonts are subset too when fontTools (and brotli, for
+# woff2) are installed. Subsets are cached by icon set and served from the asset store.
+FONT_AWESOME_ROOT = PROJECT_ROOT / "lib" / "fontawesome"
+FONT_AWESOME_LINK_RE = re.compile(r'''<link\b[^>]*\bhref=["'][^"']*(?:font-?awesome)[^"']*\.css["'][^>]*>''', re.IGNORECASE)
+ICON_CLASS_RE = re.compile(r'(?<![\w-])fa-([a-z0-9]+(?:-[a-z0-9]+)*)(?![\w-])')
+ICON_STYLE_RE = re.compile(r'(?<![\w-])(far|fab|fa-regular|fa-brands)(?![\w-])')
+ICON_RULE_RE = re.compile(r'^\.fa-([a-z0-9-]+)::?before$')
+ICON_CODEPOINT_RE = re.compile(r'''(?:content|--fa)\s*:\s*["']\\([0-9a-fA-F]+)["']''')
+FONT_URL_RE = re.compile(r'''url\(["']?[^"')]*?/(?P<stem>fa-[\w-]+)\.woff2["']?\)''')
+ICON_STYLE_FONTS = {'solid': 'fa-solid-900', 'regular': 'fa-regular-400', 'brands': 'fa-brands-400'}
+ICON_CACHE = PROJECT_ROOT / ".cache" / "icons"
+ICON_SUBSET_VERSION = "1"
+
 def log(msg, symbol="[*]"):
     """Terminal-safe logging without emojis to avoid Windows encoding issues."""
     try:
@@ -23,12 +118,324 @@ def log(msg, symbol="[*]"):
         # Fallback for extremely restricted terminals
         print(f"[*] {msg}")
 
+# --- Build instrumentation (build.py --profile) ---
+# Counters for the stage currently running in this process; None when nothing is tracked
+_STATS = None
+# Trees outputs are being written to (staging included), most specific first; reported
+# paths are relative to them, i.e. where the file ends up in dist/ once swapped in
+_OUTPUT_ROOTS = []
+LARGEST_FILES_KEPT = 10
+
+def new_stats():
+    return {"seconds": 0.0, "bytes_read": 0, "bytes_written": 0, "bytes_output": 0,
+            "files_written": 0, "files_skipped": 0, "largest": []}
+
+def stats_add(key, amount=1):
+    if _STATS is not None:
+        _STATS[key] += amount
+
+def stats_output(path, size, physical=True):
+    """Count one produced output; linked outputs add to dist/ size but cost no write I/O."""
+    if _STATS is None:
+        return
+    _STATS["files_written"] += 1
+    _STATS["bytes_output"] += size
+    if physical:
+        _STATS["bytes_written"] += size
+    path = Path(path).resolve()
+    for root in _OUTPUT_ROOTS:
+        if root == path or root in path.parents:
+            path = f"{DIST_ROOT.name}/{path.relative_to(root).as_posix()}"
+            break
+    else:
+        try:
+            path = path.relative_to(PROJECT_ROOT).as_posix()
+        except ValueError:
+            path = str(path)
+    _STATS["largest"] = sorted(_STATS["largest"] + [[size, path]], reverse=True)[:LARGEST_FILES_KEPT]
+
+# Count the shared helpers' reads, outputs and skips in the current stage
+file_sync.on_read = lambda num_bytes: stats_add("bytes_read", num_bytes)
+file_sync.on_output = stats_output
+file_sync.on_skip = lambda: stats_add("files_skipped")
+
+def merge_stats(into, other):
+    for key in ("seconds", "bytes_read", "bytes_written", "bytes_output", "files_written", "files_skipped"):
+        into[key] += other.get(key, 0)
+    into["largest"] = sorted(into["largest"] + other.get("largest", []), reverse=True)[:LARGEST_FILES_KEPT]
+    return into
+
+@contextmanager
+def track(stats, output_roots=()):
+    """Route the stats_* counters into stats while the block runs, and time it."""
+    global _STATS, _OUTPUT_ROOTS
+    previous, _STATS = (_STATS, _OUTPUT_ROOTS), stats
+    _OUTPUT_ROOTS = [Path(root).resolve() for root in output_roots if root is not None]
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["seconds"] += time.perf_counter() - start
+        _STATS, _OUTPUT_ROOTS = previous
+
+class BuildProfile:
+    """Wall time, I/O and file counts per build stage, plus a per-lesson breakdown."""
+
+    def __init__(self):
+        self.stages = []
+        self.lessons = []
+        self.start = time.perf_counter()
+        self.output_roots = [DIST_ROOT]  # build() adds its staging trees
+
+    @contextmanager
+    def stage(self, name):
+        stats = dict(new_stats(), name=name)
+        self.stages.append(stats)
+        with track(stats, self.output_roots):
+            yield stats
+
+    def add_lessons(self, results):
+        """Record per-lesson stats (gathered in workers) and roll their I/O into the current stage."""
+        stage = self.stages[-1] if self.stages else None
+        for result in results:
+            stats = result.get("stats") or new_stats()
+            self.lessons.append(dict(stats, folder=result["folder"], status=result["status"]))
+            if stage is not None:
+                merge_stats(stage, dict(stats, seconds=0))  # The stage's wall time already covers it
+
+    def as_dict(self, **context):
+        largest = []
+        for stats in self.stages:  # Lesson outputs are already rolled into the lessons stage
+            largest = sorted(largest + stats["largest"], reverse=True)[:LARGEST_FILES_KEPT]
+        return dict(context, version=1, total_seconds=round(time.perf_counter() - self.start, 4),
+                    stages=self.stages, lessons=self.lessons,
+                    largest_files=[{"path": p, "bytes": b} for b, p in largest])
+
+    def print_table(self):
+        def mb(n):
+            return f"{n / (1024 * 1024):8.2f}"
+        rows = [(s["name"], s) for s in self.stages] + [(f"  {l['folder']}", l) for l in self.lessons]
+        width = max(len(name) for name, _ in rows)
+        print(f"\n{'stage':<{width}}  {'time s':>8}  {'read MB':>8}  {'write MB':>8}  {'dist MB':>8}  {'files':>6}  {'skipped':>7}")
+        for name, s in rows:
+            print(f"{name:<{width}}  {s['seconds']:8.3f}  {mb(s['bytes_read'])}  {mb(s['bytes_written'])}  "
+                  f"{mb(s['bytes_output'])}  {s['files_written']:6d}  {s['files_skipped']:7d}")
+        largest = self.as_dict()["largest_files"]
+        if largest:
+            print("\nLargest outputs:")
+            for item in largest:
+                print(f"  {mb(item['bytes'])} MB  {item['path']}")
+
+def write_if_changed(path, content):
+    """Write text only when it differs from what is already on disk. Returns True if written."""
+    try:
+        if path.read_text(encoding='utf-8') == content:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    write_atomic(path, content)
+    return True
+
+def write_atomic(path, content):
+    """
+    Replace path with new text via a temp file. Staged builds share inodes with the live
+    dist/ (hardlinks), so outputs must never be rewritten in place.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding='utf-8')
+    os.replace(tmp, path)
+    stats_output(path, len(content.encode('utf-8')))
+
+class BuildManifest:
+    """
+    Persistent record of every file in dist/ and the input it was produced from.
+
+    Each entry is keyed by the output path (relative to dist/) and stores the
+    source path, its size/mtime and a content hash. An unchanged stat skips the
+    hash entirely; a changed stat with identical content only refreshes the stat.
+    Outputs not touched during a build are stale and can be pruned.
+    """
+
+    def __init__(self, dist_root, project_root=PROJECT_ROOT):
+        self.dist_root = Path(dist_root)
+        self.project_root = Path(project_root)
+        self.path = self.dist_root / MANIFEST_NAME
+        self.entries = {}
+        self.touched = set()
+        self.loaded = False
+        # Persisted stat -> hash cache for inputs, so unchanged files are never re-read
+        self.sources = {}
+        # Outputs whose sidecars don't pay: {dist path: [size, mtime_ns, sha256, [suffixes]]}
+        self.incompressible = {}
+        # (mtime_ns, size) of the file as last loaded or saved, to notice other writers
+        self.disk_state = None
+
+    def _stat_file(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def changed_on_disk(self):
+        """True when another build has rewritten the manifest since this copy was loaded or saved."""
+        return self._stat_file() != self.disk_state
+
+    def load(self):
+        self.disk_state = self._stat_file()
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return False
+        self.entries = data.get("entries", {})
+        self.sources = data.get("sources", {})
+        self.incompressible = data.get("incompressible", {})
+        self.loaded = True
+        return True
+
+    def save(self):
+        self.dist_root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "entries": self.entries, "sources": self.sources,
+                                   "incompressible": self.incompressible},
+                                  separators=(',', ':'), sort_keys=True), encoding='utf-8')
+        os.replace(tmp, self.path)
+        self.disk_state = self._stat_file()
+
+    def out_key(self, dst):
+        return Path(dst).relative_to(self.dist_root).as_posix()
+
+    def src_key(self, src):
+        return Path(os.path.relpath(src, self.project_root)).as_posix()
+
+    def digest(self, src, st=None):
+        st = st or src.stat()
+        key = self.src_key(src)
+        cached = self.sources.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        value = file_digest(src)
+        self.sources[key] = [st.st_size, st.st_mtime_ns, value]
+        return value
+
+    def is_fresh(self, src, dst, salt=""):
+        """True if dst was produced from the current content of src (marks dst as touched)."""
+        key = self.out_key(dst)
+        entry = self.entries.get(key)
+        if entry is None or entry.get("src") != self.src_key(src) or entry.get("salt", "") != salt:
+            return False
+        try:
+            st = src.stat()
+        except OSError:
+            return False
+        if not dst.exists():
+            return False
+        if entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+            if self.digest(src, st) != entry.get("hash"):
+                return False
+            # Touched but identical (e.g. re-downloaded or re-saved): refresh the stat only
+            entry["size"], entry["mtime_ns"] = st.st_size, st.st_mtime_ns
+        self.touched.add(key)
+        return True
+
+    def record(self, src, dst, salt="", method=None):
+        st = src.stat()
+        key = self.out_key(dst)
+        entry = {"src": self.src_key(src), "hash": self.digest(src, st),
+                 "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        if salt:
+            entry["salt"] = salt
+        if method:
+            entry["method"] = method
+        self.entries[key] = entry
+        self.touched.add(key)
+
+    def entries_under(self, prefix):
+        return {k: v for k, v in self.entries.items() if k.startswith(prefix + '/')}
+
+    def merge_lesson(self, folder, entries, touched, sources=None):
+        """Replace the entries under dist/<folder> with those returned by process_lesson."""
+        for key in list(self.entries):
+            if key.startswith(folder + '/'):
+                del self.entries[key]
+        self.entries.update(entries)
+        self.touched.update(touched)
+        self.sources.update(sources or {})
+
+    def forget(self, prefixes):
+        """Drop what is recorded about the outputs under prefixes, so they are all rebuilt."""
+        for table in (self.entries, self.incompressible):
+            for key in [k for k in table if any(k == p or k.startswith(p + '/') for p in prefixes)]:
+                del table[key]
+
+    def prune(self, prefixes=None, root=None):
+        """
+        Delete outputs whose inputs were not seen this build. Returns the number removed.
+        root overrides where the outputs live (a staged lesson folder).
+        """
+        root = Path(root or self.dist_root)
+        removed = 0
+        for key in sorted(self.entries):
+            if key in self.touched:
+                continue
+            if prefixes and not any(key == p or key.startswith(p + '/') for p in prefixes):
+                continue
+            target = root / key
+            try:
+                target.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            del self.entries[key]
+            remove_empty_parents(target.parent, root)
+            removed += 1
+        if not prefixes:
+            # Full build: forget hashes of inputs that no longer exist
+            for key in [k for k in self.sources if not (self.project_root / k).exists()]:
+                del self.sources[key]
+        return removed
+
+def verify_materialized(src, dst, expected_hash=None):
+    """True if dst still holds the same bytes as src (or as expected_hash when given)."""
+    src, dst = Path(src), Path(dst)
+    try:
+        if os.path.samefile(src, dst):
+            return expected_hash is None or file_digest(src) == expected_hash
+        if src.stat().st_size != dst.stat().st_size:
+            return False
+    except OSError:
+        return False
+    return file_digest(dst) == (expected_hash or file_digest(src))
+
+def verify_dist(dist_root=None):
+    """Check every copied output recorded in the manifest against its source. Returns a list of problems."""
+    manifest = BuildManifest(dist_root or DIST_ROOT)
+    if not manifest.load():
+        return ["No build manifest found; run a build first."]
+    problems = []
+    for key, entry in sorted(manifest.entries.items()):
+        dst = manifest.dist_root / key
+        src = manifest.project_root / entry["src"]
+        if not dst.exists():
+            problems.append(f"missing output: {key}")
+        elif not src.exists():
+            problems.append(f"missing source: {entry['src']} (for {key})")
+        elif entry.get("salt"):
+            continue  # Derived output (e.g. rewritten index.html): existence is all we can check
+        elif not verify_materialized(src, dst, entry.get("hash")):
+            problems.append(f"content mismatch: {key} ({entry.get('method', 'copy')} of {entry['src']})")
+    return problems
+
 def clean_dir(directory):
     """Safely remove all files and folders in a directory."""
     if not directory.exists():
         directory.mkdir(parents=True, exist_ok=True)
         return
-    
+
     for item in directory.iterdir():
         try:
             if item.is_dir():
@@ -38,120 +445,778 @@ def clean_dir(directory):
         except Exception as e:
             pass
 
-def copy_filtered(src, dst, filter_func=None):
-    """Copy directory with filtering and size limits."""
+def copy_filtered(src, dst, filter_func=None, manifest=None, strategy='auto'):
+    """
+    Copy directory with filtering and size limits, skipping files the manifest says are
+    current. Files are materialized with the given strategy (see materialize()).
+    """
     if not src.exists():
         return
-    
+
     dst.mkdir(parents=True, exist_ok=True)
-    
+
     for item in src.iterdir():
         if item.name in ('.git', 'desktop.ini'):
             continue
-            
+
         target = dst / item.name
-        
+
         if item.is_dir():
-            copy_filtered(item, target, filter_func)
+            copy_filtered(item, target, filter_func, manifest, strategy)
         else:
             # Apply filters
             if filter_func and not filter_func(item):
                 continue
-            
+
             # Size limit check
             try:
                 if item.stat().st_size > MAX_FILE_SIZE:
                     continue
             except:
                 continue
-            
+
             try:
-                shutil.copy2(item, target)
+                place_file(item, target, manifest, strategy)
             except:
                 pass
 
-def build(target_folder=None):
-    log(f"Starting {'targeted' if target_folder else 'full'} build process...", "[BUILD]")
+def place_file(src, dst, manifest=None, strategy='auto'):
+    """Materialize one file unless the manifest says dst is already current."""
+    if manifest is not None and manifest.is_fresh(src, dst):
+        stats_add("files_skipped")
+        return False
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    method = materialize(src, dst, strategy)
+    if manifest is not None:
+        manifest.record(src, dst, method=method)
+    return True
 
-    # 1. Clean dist
-    if not target_folder:
-        clean_dir(DIST_ROOT)
-        log("Cleaned dist directory (Full Build).", "[CLEAN]")
-    else:
-        target_dist = DIST_ROOT / target_folder
-        if target_dist.exists():
-            try:
-                shutil.rmtree(target_dist, ignore_errors=True)
-            except:
-                clean_dir(target_dist)
-        target_dist.mkdir(parents=True, exist_ok=True)
-        log(f"Cleaned target dist: {target_folder}", "[CLEAN]")
-
-    # 2. Copy Shared Reveal.js Engine
-    log("Copying shared Reveal.js engine...", "[ENGINE]")
-    engine_folders = ['dist', 'plugin', 'css']
-    for folder in engine_folders:
-        src = ENGINE_ROOT / folder
-        dest = DIST_ROOT / folder
-        if src.exists():
-            copy_filtered(src, dest)
-            log(f"Copied {folder}/", "[OK]")
-        else:
-            log(f"Warning: {folder} not found in {ENGINE_ROOT}", "[WARN]")
-
-    # 3. Copy Shared Global Assets
-    log("Copying shared global assets...", "[ASSETS]")
-    if GLOBAL_IMAGES.exists():
-        copy_filtered(GLOBAL_IMAGES, DIST_ROOT / "images")
-        log("Copied root images/", "[OK]")
-
-    # 4. Process Lessons
-    log("Aggregating presentations...", "[PROCESS]")
-    if target_folder:
-        lessons_to_process = [target_folder]
+def collect_files(src, filter_func=None, base=None, max_size=MAX_FILE_SIZE):
+    """List files under src (as paths relative to base) with the same filters as copy_filtered."""
+    base = base or src
+    found = []
+    if not src.exists():
+        return found
+    for item in sorted(src.iterdir()):
+        if item.name in ('.git', 'desktop.ini'):
+            continue
+        if item.is_dir():
+            found.extend(collect_files(item, filter_func, base, max_size))
+            continue
+        if filter_func and not filter_func(item):
+            continue
+        try:
+            if max_size is not None and item.stat().st_size > max_size:
+                continue
+        except OSError:
+            continue
+        found.append(item.relative_to(base))
+    return found
+
+def store_asset(src, manifest, strategy='auto', content=None, name=None, salt=""):
+    """
+    Place src in the content-addressed store (dist/_assets) and return its store path.
+    The name is derived from the content hash, so an existing file is always current.
+    content/name/salt store a derived file (e.g. an image variant) on behalf of src.
+    """
+    if name is None:
+        name = f"{ASSET_STORE}/{manifest.digest(src)[:ASSET_HASH_LEN]}{src.suffix.lower()}"
+    dst = manifest.dist_root / name
+    if not dst.exists():
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        manifest.record(src, dst, salt=salt, method=materialize(content or src, dst, strategy))
+    elif name not in manifest.entries:
+        manifest.record(src, dst, salt=salt)
     else:
-        lessons_to_process = [d.name for d in INPUTS_DIR.iterdir() if d.is_dir()]
-    
-    for folder in lessons_to_process:
-        lesson_path = INPUTS_DIR / folder
-        if not lesson_path.exists():
+        manifest.touched.add(name)
+        stats_add("files_skipped")
+    return name
+
+def image_formats():
+    """Modern formats this Pillow build can encode, best first."""
+    if Image is None:
+        return ()
+    return tuple(fmt for fmt in IMAGE_ENCODE_OPTIONS if pil_features.check(fmt))
+
+def _encode_variant(image, width, fmt, out):
+    if image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    image.save(tmp, format=fmt.upper(), **IMAGE_ENCODE_OPTIONS[fmt])
+    os.replace(tmp, out)
+    stats_add("bytes_written", out.stat().st_size)
+
+def image_variants(src, digest, cache_dir=IMAGE_CACHE, formats=None, widths=IMAGE_WIDTHS):
+    """
+    Resized WebP/AVIF variants of a raster image, encoded in parallel and cached by source
+    hash. Returns {fmt: [(width, cached path), ...]} with widths ascending. formats narrows
+    the supported formats (best first) and widths the target widths, for callers that only
+    need one variant (bundle_reveal.py --optimize).
+    """
+    formats = [fmt for fmt in image_formats() if formats is None or fmt in formats]
+    if not formats:
+        return {}
+    with Image.open(src) as probe:
+        source_width = probe.width
+    widths = sorted({w for w in widths if w < source_width} | {min(source_width, max(widths))})
+    variants = {fmt: [(w, Path(cache_dir) / f"{digest[:ASSET_HASH_LEN]}-{w}.{fmt}") for w in widths]
+                for fmt in formats}
+    todo = [(w, fmt, path) for fmt, items in variants.items() for w, path in items if not path.exists()]
+    if todo:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        with Image.open(src) as im:
+            im.load()
+            image = im.convert('RGBA' if im.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        # Pillow releases the GIL while resizing/encoding, so threads give real parallelism
+        with ThreadPoolExecutor(max_workers=min(len(todo), os.cpu_count() or 1)) as pool:
+            list(pool.map(lambda t: _encode_variant(image, t[0], t[1], t[2]), todo))
+    return variants
+
+def rewrite_images(content, responsive):
+    """
+    Point <img> tags and slide backgrounds at responsive variants. responsive maps a
+    lesson-relative image path to {"srcset": {fmt: "url w, ..."}, "best": url}.
+    <img> becomes a display:contents <picture> so the slide layout is unaffected; lazy
+    <img data-src> (loaded by Reveal, which ignores <source>) just gets the best variant.
+    """
+    def swap_img(match):
+        tag = match.group(0)
+        src = re.search(r'''\s(data-)?src=(["'])(?:\./)?(.*?)\2''', tag)
+        if not src or 'srcset=' in tag:
+            return tag
+        variant = responsive.get(unquote(src.group(3)))
+        if not variant:
+            return tag
+        if src.group(1):
+            return tag[:src.start()] + f' data-src="{variant["best"]}"' + tag[src.end():]
+        sources = "".join(f'<source type="image/{fmt}" srcset="{srcset}" sizes="100vw">'
+                          for fmt, srcset in variant["srcset"].items())
+        img = tag[:src.start()] + f' src="{variant["best"]}"' + tag[src.end():]
+        return f'<picture style="display: contents">{sources}{img}</picture>'
+
+    def swap_background(match):
+        variant = responsive.get(unquote(match.group('path')))
+        if not variant:
+            return match.group(0)
+        return f'{match.group("attr")}{match.group("q")}{variant["best"]}{match.group("q")}'
+
+    content = IMG_TAG_RE.sub(swap_img, content)
+    return BACKGROUND_REF_RE.sub(swap_background, content)
+
+def find_asset_refs(content):
+    """Lesson-relative images/ and audio/ paths referenced anywhere in the HTML (unquoted)."""
+    return {unquote(m.group('path')) for m in ASSET_REF_RE.finditer(content)}
+
+def deck_scripts(content, base_dir):
+    """Text of the deck's local <script src> files, plus slide-components.js when its elements are used."""
+    scripts = set()
+    for match in SCRIPT_SRC_RE.finditer(content):
+        src = unquote(match.group('src').split('?')[0])
+        if '://' not in src and not src.startswith(('/', 'data:')):
+            scripts.add((Path(base_dir) / src).resolve())
+    if any(tag in content for tag in COMPONENT_TAGS):
+        scripts.add(COMPONENT_SCRIPT.resolve())
+    texts = []
+    for script in sorted(scripts):
+        try:
+            texts.append(script.read_text(encoding='utf-8'))
+        except (OSError, UnicodeDecodeError):
             continue
+    return texts
+
+def script_asset_refs(content, base_dir):
+    """
+    Assets named by the deck's own scripts: local <script src> files next to the deck, and
+    the slide-components.js sounds whenever the deck uses one of its custom elements.
+    """
+    refs = set()
+    for text in deck_scripts(content, base_dir):
+        refs |= find_asset_refs(text)
+    return refs
+
+def _css_blocks(css):
+    """Top-level (prelude, body) pairs of a stylesheet; nested at-rule bodies stay whole."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    blocks, depth, last, start = [], 0, 0, 0
+    for i, ch in enumerate(css):
+        if ch == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                blocks.append((css[last:start].strip(), css[start + 1:i]))
+                last = i + 1
+    return blocks
+
+def icon_subset(icons, styles, root=FONT_AWESOME_ROOT, cache_dir=ICON_CACHE, digest=file_digest):
+    """
+    Cut lib/fontawesome down to the given icon names and styles. Returns the cached
+    stylesheet and {font store name: file} (subset woff2 with fontTools, else the originals);
+    the stylesheet refers to the fonts by those names, so they must sit next to it.
+    digest hashes the package files; pass a BuildManifest's so unchanged files aren't re-read.
+    """
+    css_path = Path(root) / "css" / "all.min.css"
+    fonts = {ICON_STYLE_FONTS[style] for style in styles}
+    subset = font_subset is not None and brotli is not None
+    key = hashlib.sha256(json.dumps([ICON_SUBSET_VERSION, sorted(icons), sorted(fonts), subset,
+                                     digest(css_path)]).encode()).hexdigest()[:ASSET_HASH_LEN]
+    out_dir = Path(cache_dir) / key
+    font_files = {}
+    for stem in sorted(fonts):
+        src = Path(root) / "webfonts" / f"{stem}.woff2"
+        if src.exists():
+            name = f"{stem}.{key if subset else digest(src)[:ASSET_HASH_LEN]}.woff2"
+            font_files[stem] = (name, out_dir / name if subset else src)
+
+    stylesheet = out_dir / f"fa-icons.{key}.css"
+    if stylesheet.exists():
+        return stylesheet, dict(font_files.values())
+
+    source = css_path.read_text(encoding='utf-8')
+    license_note = re.match(r'\s*(/\*!.*?\*/)', source, re.DOTALL)
+    rules, codepoints = [], set()
+    for prelude, body in _css_blocks(source):
+        if prelude == '@font-face':
+            url = FONT_URL_RE.search(body)
+            if not url or url.group('stem') not in font_files:
+                continue
+            # woff2 only: every projector browser we support reads it
+            body = re.sub(r'src\s*:[^;}]*', f'src:url({font_files[url.group("stem")][0]}) format("woff2")', body)
+        elif not prelude.startswith('@'):
+            selectors = [sel.strip() for sel in prelude.split(',')]
+            names = [ICON_RULE_RE.match(sel) for sel in selectors]
+            if any(names):
+                kept = [sel for sel, name in zip(selectors, names) if not name or name.group(1) in icons]
+                if not kept:
+                    continue
+                if any(name and name.group(1) in icons for name in names):
+                    codepoint = ICON_CODEPOINT_RE.search(body)
+                    if codepoint:
+                        codepoints.add(int(codepoint.group(1), 16))
+                prelude = ",".join(kept)
+        rules.append(f"{prelude}{{{body}}}")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if subset:
+        for stem, (name, out) in font_files.items():
+            options = font_subset.Options()
+            options.flavor = 'woff2'
+            font = font_subset.load_font(str(Path(root) / "webfonts" / f"{stem}.woff2"), options)
+            subsetter = font_subset.Subsetter(options)
+            subsetter.populate(unicodes=codepoints)
+            subsetter.subset(font)
+            tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+            font_subset.save_font(font, str(tmp), options)
+            os.replace(tmp, out)
+    header = license_note.group(1) + "\n" if license_note else ""
+    write_atomic(stylesheet, header + "".join(rules))
+    return stylesheet, dict(font_files.values())
+
+def local_icons(content, base_dir, manifest, strategy='auto'):
+    """
+    Store path of a Font Awesome stylesheet covering the icons this deck (and its scripts)
+    use, or None when the deck doesn't link Font Awesome or lib/fontawesome is missing.
+    """
+    if not FONT_AWESOME_LINK_RE.search(content) or not (FONT_AWESOME_ROOT / "css" / "all.min.css").exists():
+        return None
+    texts = [content] + deck_scripts(content, base_dir)
+    icons = {m.group(1) for text in texts for m in ICON_CLASS_RE.finditer(text)}
+    styles = {'solid'} | {{'far': 'regular', 'fa-regular': 'regular'}.get(m.group(1), 'brands')
+                          for text in texts for m in ICON_STYLE_RE.finditer(text)}
+    stylesheet, fonts = icon_subset(icons, styles, digest=manifest.digest)
+    source = FONT_AWESOME_ROOT / "css" / "all.min.css"
+    salt = f"icons:{ICON_SUBSET_VERSION}"
+    for name, path in fonts.items():
+        store_asset(source, manifest, strategy, content=path, name=f"{ASSET_STORE}/{name}", salt=salt)
+    return store_asset(source, manifest, strategy, content=stylesheet,
+                       name=f"{ASSET_STORE}/{stylesheet.name}", salt=salt)
+
+def rewrite_asset_refs(content, resolve):
+    """
+    Rewrite relative images/ and audio/ references in lesson HTML. resolve(path) gets the
+    unquoted lesson-relative path and returns the replacement URL, or None to keep it.
+    Returns the new content and the set of paths that were referenced.
+    """
+    referenced = set()
+
+    def swap(match):
+        path = unquote(match.group('path'))
+        referenced.add(path)
+        new = resolve(path)
+        return match.group('pre') + new if new else match.group(0)
+
+    return ASSET_REF_RE.sub(swap, content), referenced
+
+def process_lesson(folder, entries=None, dist_root=None, options=None):
+    """
+    Build one lesson into dist/<folder>. Runs in a worker process when --jobs > 1,
+    so it only touches its own manifest entries and reports back instead of logging.
+    options is a plain dict of build switches (see build()) so it pickles to workers.
+    """
+    dist_root = Path(dist_root or DIST_ROOT)
+    options = options or {}
+    manifest = BuildManifest(dist_root)
+    manifest.entries = dict(entries or {})
+    manifest.sources = dict(options.get("sources") or {})
+    result = {"folder": folder, "status": "skipped", "error": None, "entries": {}, "touched": [],
+              "sources": {}, "assets": [], "warnings": [], "orphans": [],
+              "stats": new_stats()}
+    with track(result["stats"], [dist_root]):
+        _process_lesson(folder, dist_root, options, manifest, result)
+    result["entries"] = manifest.entries
+    result["touched"] = sorted(manifest.touched)
+    result["sources"] = manifest.sources
+    return result
+
+def _process_lesson(folder, dist_root, options, manifest, result):
+    strategy = options.get("strategy", "auto")
+
+    lesson_path = INPUTS_DIR / folder
+    published_path = lesson_path / "published"
+    index_html = published_path / "index.html"
+    source_dir = published_path
+
+    if not index_html.exists():
+        index_html = lesson_path / "index.html"
+        source_dir = lesson_path
 
-        published_path = lesson_path / "published"
-        index_html = published_path / "index.html"
-        source_dir = published_path
-        
-        if not index_html.exists():
-            index_html = lesson_path / "index.html"
-            source_dir = lesson_path
-            
-        if index_html.exists():
-            log(f"Processing lesson: {folder}", "[OK]")
-            dest_lesson_dir = DIST_ROOT / folder
+    if lesson_path.exists() and index_html.exists():
+        dest_lesson_dir = dist_root / folder
+        try:
             dest_lesson_dir.mkdir(parents=True, exist_ok=True)
+            dest_index = dest_lesson_dir / "index.html"
 
-            try:
-                content = index_html.read_text(encoding='utf-8')
+            def asset_filter(p):
+                return p.suffix.lower() not in SKIP_EXTENSIONS
+
+            content = index_html.read_text(encoding='utf-8')
+            stats_add("bytes_read", len(content.encode('utf-8')))
+            referenced = find_asset_refs(content)
+            # Scripts build their own URLs at runtime: those files ship lesson-local, unrewritten
+            script_refs = script_asset_refs(content, index_html.parent)
+            copy_all = options.get("copy_all_assets", False)
+            icons = local_icons(content, index_html.parent, manifest, strategy)
+            optimize = options.get("optimize_images", True) and bool(image_formats())
+
+            assets = {}
+            for asset_folder in ['images', 'audio']:
+                for rel in collect_files(source_dir / asset_folder, asset_filter, max_size=None):
+                    rel = (Path(asset_folder) / rel).as_posix()
+                    path = source_dir / rel
+                    if rel not in referenced and rel not in script_refs:
+                        result["orphans"].append((rel, path.stat().st_size))
+                        if not copy_all:
+                            continue
+                    if path.stat().st_size <= MAX_FILE_SIZE:
+                        assets[rel] = path
+                    elif optimize and rel in referenced and path.suffix.lower() in RASTER_EXTENSIONS:
+                        assets[rel] = path  # Ships as optimized variants only, never the original
+                    elif rel in referenced:
+                        hint = "" if optimize else "; install Pillow to ship optimized variants"
+                        result["warnings"].append(
+                            f"dropped {rel} ({path.stat().st_size / (1024 * 1024):.1f} MB > limit{hint})")
+
+            # Responsive variants for every referenced raster image, served from the shared store
+            responsive = {}
+            if optimize:
+                for rel, path in assets.items():
+                    if rel in referenced and rel.startswith('images/') and path.suffix.lower() in RASTER_EXTENSIONS:
+                        variants = image_variants(path, manifest.digest(path))
+                        salt = f"variant:{IMAGE_PIPELINE_VERSION}"
+                        urls = {fmt: [(w, "../" + store_asset(path, manifest, strategy, content=cached,
+                                                               name=f"{ASSET_STORE}/{cached.name}", salt=salt))
+                                      for w, cached in items] for fmt, items in variants.items()}
+                        # Backgrounds and plain references can't negotiate a format: use the most compatible
+                        best_fmt = 'webp' if 'webp' in urls else next(iter(urls))
+                        responsive[rel] = {"srcset": {fmt: ", ".join(f"{url} {w}w" for w, url in items)
+                                                      for fmt, items in urls.items()},
+                                           "best": urls[best_fmt][-1][1]}
+
+            # Content hash of every asset decides its store name, so it is part of the HTML's identity
+            hashes = {}
+            if options.get("dedupe", True) or responsive:
+                hashes = {rel: manifest.digest(path) for rel, path in assets.items()}
+            stored = {rel for rel in hashes if rel in referenced and rel not in responsive}
+            if not options.get("dedupe", True):
+                stored = set()
+
+            # Only the fingerprints this deck actually points at affect its output
+            fingerprints = options.get("fingerprints") or {}
+            used_fingerprints = {}
+            if fingerprints:
+                shared_refs = {unquote(m.group('path')) for m in SHARED_REF_RE.finditer(
+                    re.sub(r'(href|src)=["\']/?(dist|plugin)/', r'\1="../\2/', content))}
+                used_fingerprints = {k: fingerprints[k] for k in shared_refs if k in fingerprints}
+
+            salt = HTML_TRANSFORM_VERSION
+            if hashes or used_fingerprints or icons:
+                identity = json.dumps([hashes, used_fingerprints, responsive, icons], sort_keys=True).encode()
+                salt += ":" + hashlib.sha256(identity).hexdigest()[:16]
+
+            if manifest.is_fresh(index_html, dest_index, salt=salt):
+                result["status"] = "unchanged"
+                stats_add("files_skipped")
+            else:
                 content = re.sub(r'(href|src)=["\']/?dist/', r'\1="../dist/', content)
                 content = re.sub(r'(href|src)=["\']/?plugin/', r'\1="../plugin/', content)
-                (dest_lesson_dir / "index.html").write_text(content, encoding='utf-8')
-
-                for asset_folder in ['images', 'audio']:
-                    src_asset = source_dir / asset_folder
-                    if src_asset.exists():
-                        def asset_filter(p):
-                            return p.suffix.lower() not in SKIP_EXTENSIONS
-                        copy_filtered(src_asset, dest_lesson_dir / asset_folder, asset_filter)
+                if responsive:
+                    content = rewrite_images(content, responsive)
+                if icons:
+                    content = FONT_AWESOME_LINK_RE.sub(f'<link rel="stylesheet" href="../{icons}">', content, count=1)
+
+                def resolve(rel):
+                    if rel in responsive:
+                        return responsive[rel]["best"]
+                    if rel in stored:
+                        return f"../{ASSET_STORE}/{hashes[rel][:ASSET_HASH_LEN]}{assets[rel].suffix.lower()}"
+                    return None
+                content, _ = rewrite_asset_refs(content, resolve)
+                if used_fingerprints:
+                    content = SHARED_REF_RE.sub(lambda m: m.group('pre') + "../" + used_fingerprints.get(
+                        unquote(m.group('path')), m.group('path')), content)
+                write_atomic(dest_index, content)
+                manifest.record(index_html, dest_index, salt=salt)
+                result["status"] = "built"
+
+            for rel, path in assets.items():
+                if rel in responsive:
+                    result["assets"].append((hashes[rel], path.stat().st_size))
+                    if rel not in script_refs:
+                        continue  # Shipped as variants above
+                if path.stat().st_size > MAX_FILE_SIZE:
+                    continue
+                if rel in stored:
+                    # Referenced from the HTML: one shared copy serves every deck
+                    store_asset(path, manifest, strategy)
+                    result["assets"].append((hashes[rel], path.stat().st_size))
+                if rel not in stored or rel in script_refs:
+                    # Scripts (and --copy-all-assets/--no-dedupe) resolve against the lesson folder
+                    place_file(path, dest_lesson_dir / rel, manifest, strategy)
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = f"{type(e).__name__}: {e}"
+
+def run_lessons(folders, manifest, jobs=1, options=None, dist_root=None):
+    """
+    Process lessons sequentially or fanned out over a process pool; results keep input order.
+    dist_root overrides where lesson outputs are written (a staging root for targeted builds).
+    """
+    dist_root = dist_root or manifest.dist_root
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    options = dict(options or {}, sources=manifest.sources)
+    work = [(folder, manifest.entries_under(folder)) for folder in folders]
+
+    if jobs <= 1 or len(work) <= 1:
+        return [process_lesson(folder, entries, dist_root, options) for folder, entries in work]
+
+    log(f"Processing {len(work)} lessons with {min(jobs, len(work))} workers...", "[PROCESS]")
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+        futures = [pool.submit(process_lesson, folder, entries, dist_root, options) for folder, entries in work]
+        for (folder, entries), future in zip(work, futures):
+            try:
+                results.append(future.result())
             except Exception as e:
-                 log(f"Error processing {folder}: {e}", "[ERROR]")
+                # Worker crashed (e.g. BrokenProcessPool): keep its previous outputs alive
+                results.append({"folder": folder, "status": "error", "error": f"{type(e).__name__}: {e}",
+                                "entries": entries, "touched": list(entries), "sources": {}, "assets": [],
+                                "warnings": [], "orphans": [], "stats": new_stats()})
+    return results
+
+def report_lessons(results):
+    """Print a structured per-lesson summary instead of interleaved worker log lines."""
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        if result["status"] == "built":
+            log(f"Processed lesson: {result['folder']}", "[OK]")
+
+    summary = ", ".join(f"{counts[k]} {k}" for k in ("built", "unchanged", "skipped", "error") if k in counts)
+    log(f"Lessons: {summary or 'none'}", "[PROCESS]")
+
+    for r in results:
+        for warning in r.get("warnings", []):
+            log(f"{r['folder']}: {warning}", "[WARN]")
+
+    errors = [r for r in results if r["status"] == "error"]
+    if errors:
+        width = max(len(r["folder"]) for r in errors)
+        log(f"{len(errors)} lesson(s) failed:", "[ERROR]")
+        for r in errors:
+            print(f"    {r['folder']:<{width}}  {r['error']}")
+
+def report_orphans(results):
+    """List lesson images/audio that neither the deck nor its scripts reference."""
+    total = 0
+    for result in results:
+        if not result.get("orphans"):
+            continue
+        size = sum(s for _, s in result["orphans"])
+        total += size
+        log(f"{result['folder']}: {len(result['orphans'])} unreferenced file(s), {size / (1024 * 1024):.1f} MB", "[ORPHAN]")
+        for rel, s in result["orphans"]:
+            print(f"    {s / 1024:9.1f} KB  {rel}")
+    log(f"Unreferenced lesson assets: {total / (1024 * 1024):.1f} MB" if total else "No unreferenced lesson assets.",
+        "[ORPHAN]")
+
+def fingerprint_name(key, digest):
+    stem, dot, ext = key.rpartition('.')
+    return f"{stem}.{digest[:FINGERPRINT_LEN]}.{ext}" if dot else f"{key}.{digest[:FINGERPRINT_LEN]}"
+
+def fingerprint_shared(manifest, strategy='auto'):
+    """
+    Give every shared engine/global file a content-hashed twin next to it (relative URLs
+    inside CSS keep resolving) and return {logical path: fingerprinted path}. The twins are
+    safe to cache forever: a content change produces a new name.
+    """
+    mapping = {}
+    for key, entry in sorted(manifest.entries.items()):
+        if entry.get("fingerprint_of") or entry.get("salt"):
+            continue
+        if key.split('/', 1)[0] not in SHARED_FOLDERS:
+            continue
+        if Path(key).suffix.lower() not in FINGERPRINT_EXTENSIONS:
+            continue
+        fp_key = fingerprint_name(key, entry["hash"])
+        src = manifest.project_root / entry["src"]
+        dst = manifest.dist_root / fp_key
+        if not manifest.is_fresh(src, dst):
+            method = materialize(manifest.dist_root / key, dst, strategy)
+            manifest.record(src, dst, method=method)
+        else:
+            stats_add("files_skipped")
+        manifest.entries[fp_key]["fingerprint_of"] = key
+        mapping[key] = fp_key
+    return mapping
+
+def write_asset_manifest(dist_root, mapping):
+    """dist/asset-manifest.json: logical path -> immutable fingerprinted path."""
+    data = {"version": 1, "immutable": [f"{ASSET_STORE}/"], "assets": mapping}
+    return write_if_changed(Path(dist_root) / ASSET_MANIFEST_NAME, json.dumps(data, indent=2, sort_keys=True))
+
+def report_dedupe(results):
+    """Summarize how much the shared asset store saved compared with per-lesson copies."""
+    unique, total, refs = {}, 0, 0
+    for result in results:
+        for digest, size in result["assets"]:
+            unique[digest] = size
+            total += size
+            refs += 1
+    if refs:
+        saved = total - sum(unique.values())
+        log(f"{refs} lesson asset(s) -> {len(unique)} unique in {ASSET_STORE}/, "
+            f"saved {saved / (1024 * 1024):.1f} MB", "[DEDUPE]")
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def open_stage(live, seed=True):
+    """
+    Create a fresh staging directory on the same filesystem as live, seeded with hardlinks
+    to the current outputs so incremental builds only rewrite what changed. When live is a
+    symlink (dist -> dist-<stamp>) the stage is a new versioned sibling of its target.
+    """
+    live = Path(live)
+    if live.is_symlink():
+        real = live.resolve()
+        staged = real.with_name(f"{live.name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    else:
+        staged = live.with_name(f".{live.name}-staging")
+    shutil.rmtree(staged, ignore_errors=True)  # Left over from an interrupted build
+    if seed and live.is_dir():
+        shutil.copytree(live, staged, symlinks=True, copy_function=_link_or_copy)
+    else:
+        staged.mkdir(parents=True)
+    return staged
 
-    # 5. Update Dashboard
+def _rename_exchange(a, b):
+    """Atomically swap two paths (Linux renameat2 RENAME_EXCHANGE). False if unsupported."""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = libc.renameat2
+    except (OSError, AttributeError):
+        return False
+    AT_FDCWD, RENAME_EXCHANGE = -100, 2
+    return renameat2(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE) == 0
+
+def forced_manifest(manifest, targets):
+    """
+    The manifest a --force build starts from: empty for a full build, while a targeted one
+    only forgets its own lessons; the other lessons' outputs stay recorded (and prunable).
+    """
+    if targets and manifest.loaded:
+        manifest.forget(targets)
+        return manifest
+    return BuildManifest(DIST_ROOT)
+
+def swap_in(staged, live):
+    """
+    Put staged in place of live in one step: a symlink flip when live is a symlink, else an
+    atomic directory exchange (two quick renames where that is unavailable). Returns the
+    old tree, which the caller deletes, or None.
+    """
+    staged, live = Path(staged), Path(live)
+    if live.is_symlink():
+        old = live.resolve()
+        link = live.with_name(f".{live.name}.{os.getpid()}.link")
+        os.symlink(os.path.relpath(staged, live.parent), link, target_is_directory=True)
+        os.replace(link, live)
+        return old
+    if not live.exists():
+        os.rename(staged, live)
+        return None
+    if _rename_exchange(staged, live):
+        return staged  # Now holds the previous tree
+    old = live.with_name(f".{live.name}-old")
+    shutil.rmtree(old, ignore_errors=True)
+    os.rename(live, old)  # Fails with live untouched when a file in it is held open (Windows)
+    try:
+        os.rename(staged, live)
+    except OSError:
+        os.rename(old, live)  # Put the previous tree back before reporting
+        raise
+    return old
+
+def swap_failed(results, folders, error, manifest):
+    """Report a staged tree that could not be swapped in; marks those lessons' results as errors."""
+    manifest.disk_state = None  # This copy describes the discarded build: callers reload it next time
+    log(f"Could not swap the new build into place ({error}). Is a server or editor holding a file "
+        f"in dist/ open? Close it and build again.", "[ERROR]")
+    for result in results:
+        if not folders or result["folder"] in folders:
+            result["status"], result["error"] = "error", f"swap failed: {error}"
+    return results
+
+def sidecar_encodings():
+    """Sidecar suffixes this Python can produce (brotli is an optional dependency)."""
+    return tuple(ext for ext in SIDECAR_ENCODINGS if ext != '.br' or brotli is not None)
+
+def _stale_sidecars(path, st, encodings):
+    """Sidecar suffixes of path not stamped with its current mtime (i.e. made from older content)."""
+    stale = []
+    for ext in encodings:
+        try:
+            if path.with_name(path.name + ext).stat().st_mtime_ns == st.st_mtime_ns:
+                stats_add("files_skipped")
+                continue
+        except FileNotFoundError:
+            pass
+        stale.append(ext)
+    return stale
+
+def _pack(data, encodings):
+    """Compressed bytes per suffix, or None where compression doesn't pay."""
+    packed = {}
+    for ext in encodings:
+        out = SIDECAR_ENCODINGS[ext](data)
+        packed[ext] = out if len(out) <= len(data) * (1 - COMPRESS_MIN_SAVING) else None
+    return packed
+
+def _write_sidecar(path, st, ext, packed):
+    sidecar = path.with_name(path.name + ext)
+    if packed is None:
+        sidecar.unlink(missing_ok=True)  # Doesn't pay: let the server send the original
+        return 0
+    tmp = sidecar.with_name(f".{sidecar.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(packed)
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp, sidecar)
+    stats_output(sidecar, len(packed))
+    return 1
+
+def precompress(root, jobs=1, manifest=None, prefix=""):
+    """
+    Give every compressible file under root .gz (and, with brotli installed, .br) sidecars.
+    A sidecar carries the mtime of the file it was made from, so only changed files are
+    recompressed, and identical files (fingerprinted twins) are compressed once. Sidecars
+    whose original is gone or no longer pays are removed; with a manifest, that decision is
+    kept (by stat and content hash) so the file isn't compressed again until it changes.
+    prefix is root's path inside dist/ (a staged lesson folder), for the manifest keys.
+    Returns (sidecars written, sidecars removed).
+    """
+    root = Path(root)
+    encodings = sidecar_encodings()
+    skipped = manifest.incompressible if manifest is not None else {}
+    work, removed, seen = {}, 0, set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        names, orphaned = set(filenames), False
+        for name in filenames:
+            path = Path(dirpath) / name
+            stem, ext = os.path.splitext(name)
+            if ext in SIDECAR_ENCODINGS:
+                if stem not in names or not _compressible(Path(dirpath) / stem) or ext not in encodings:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                    orphaned = orphaned or stem not in names
+            elif _compressible(path):
+                st = path.stat()
+                stale = _stale_sidecars(path, st, encodings)
+                key = Path(prefix, path.relative_to(root)).as_posix()
+                seen.add(key)
+                record = skipped.get(key)
+                if stale and record and record[:2] == [st.st_size, st.st_mtime_ns]:
+                    stats_add("files_skipped", sum(ext in record[3] for ext in stale))
+                    stale = [ext for ext in stale if ext not in record[3]]
+                if stale:
+                    data = path.read_bytes()
+                    stats_add("bytes_read", len(data))
+                    digest = hashlib.sha256(data).hexdigest()
+                    if record and record[2] == digest:
+                        # Rewritten with the same content: still not worth compressing
+                        record[:2] = [st.st_size, st.st_mtime_ns]
+                        stale = [ext for ext in stale if ext not in record[3]]
+                    if stale:
+                        group = work.setdefault(digest, [data, []])
+                        group[1].append((path, st, stale, key))
+        if orphaned:
+            # prune() could not remove a deleted lesson's folder while its sidecars were still there
+            remove_empty_parents(Path(dirpath), root)
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    written = 0
+    # zlib and brotli release the GIL, so threads scale here
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        groups = list(work.values())
+        for digest, (_, members), packed in zip(work, groups, pool.map(lambda g: _pack(g[0], encodings), groups)):
+            for path, st, stale, key in members:
+                written += sum(_write_sidecar(path, st, ext, packed[ext]) for ext in stale)
+                unpaid = sorted(ext for ext in encodings if packed.get(ext, 1) is None)
+                if unpaid:
+                    skipped[key] = [st.st_size, st.st_mtime_ns, digest, unpaid]
+                else:
+                    skipped.pop(key, None)
+    for key in [k for k in skipped if k not in seen and (not prefix or k.startswith(prefix + '/'))]:
+        del skipped[key]
+    return written, removed
+
+def _compressible(path):
+    if path.name.startswith('.') or path.suffix.lower() not in COMPRESS_EXTENSIONS:
+        return False
+    try:
+        return path.stat().st_size >= COMPRESS_MIN_SIZE
+    except OSError:
+        return False
+
+def update_dashboard(dist_root=None):
+    """Regenerate dist/index.html, the library page listing every built lesson."""
+    dist_root = Path(dist_root or DIST_ROOT)
     log("Updating dashboard...", "[DASHBOARD]")
     dashboard_lessons = []
-    
-    if DIST_ROOT.exists():
-        for d in DIST_ROOT.iterdir():
-            if d.is_dir() and d.name not in ('dist', 'plugin', 'css', 'images'):
+
+    if dist_root.exists():
+        for d in sorted(dist_root.iterdir()):
+            if d.is_dir() and not d.name.startswith('.') and d.name not in SHARED_FOLDERS + (ASSET_STORE,):
                 idx = d / "index.html"
                 if idx.exists():
                     try:
@@ -187,9 +1252,461 @@ def build(target_folder=None):
 </body>
 </html>
     """
-    (DIST_ROOT / "index.html").write_text(dashboard_html, encoding='utf-8')
+    if not write_if_changed(dist_root / "index.html", dashboard_html):
+        log("Dashboard unchanged.", "[SKIP]")
+
+def build(target_folder=None, force=False, jobs=1, strategy='auto', dedupe=True, fingerprint=True,
+          optimize_images=True, copy_all_assets=False, staged=True, compress=True, profile=None,
+          manifest=None):
+    """
+    Build dist/. target_folder is one lesson folder or a list of them (targeted build);
+    None builds the whole library. Pass a BuildProfile to collect per-stage timing and I/O
+    (--profile), and a loaded BuildManifest of dist/ to skip reading it again (--watch).
+
+    With staged=True a full build is written to a staging copy of dist/ and swapped in at
+    the end, and a targeted build stages and swaps only dist/<lesson>; the preview server
+    never sees partial output and a failed build leaves the live tree untouched.
+    Returns the per-lesson results.
+    """
+    profile = profile or BuildProfile()
+    targets = [target_folder] if isinstance(target_folder, str) else list(target_folder or [])
+    log(f"Starting {'targeted' if targets else 'full'} build process...", "[BUILD]")
+
+    options = {"strategy": strategy, "dedupe": dedupe, "optimize_images": optimize_images,
+               "copy_all_assets": copy_all_assets}
+    if optimize_images and not image_formats():
+        log("Pillow with WebP/AVIF support not installed: image optimization disabled.", "[WARN]")
+    if compress and brotli is None:
+        log("brotli not installed: writing gzip sidecars only.", "[WARN]")
+    if manifest is None or manifest.dist_root != DIST_ROOT or manifest.changed_on_disk():
+        manifest = BuildManifest(DIST_ROOT)  # Also when another build.py run saved a newer one
+        manifest.load()
+    incremental = not force and manifest.loaded
+    manifest.touched = set()
+
+    root = DIST_ROOT                 # Where shared outputs, the manifest and the dashboard go
+    lesson_root = None               # Where lesson folders go, when not root
+    staging = []                     # (staged tree, live path it replaces)
+
+    try:
+        # 1. Stage (or clean) dist; with a manifest, stale outputs are pruned at the end instead
+        with profile.stage("stage"):
+            if staged and not targets:
+                root = open_stage(DIST_ROOT, seed=incremental)
+                staging = [(root, DIST_ROOT)]
+                entries, sources, incompressible = manifest.entries, manifest.sources, manifest.incompressible
+                manifest = BuildManifest(root)
+                manifest.entries, manifest.sources = (entries, sources) if incremental else ({}, {})
+                manifest.incompressible = incompressible if incremental else {}
+                log(f"Staging full build in {root.name}/ "
+                    f"({len(manifest.entries) if incremental else 'no'} outputs carried over).", "[STAGE]")
+            elif staged:
+                DIST_ROOT.mkdir(parents=True, exist_ok=True)
+                lesson_root = DIST_ROOT / ".staging"
+                shutil.rmtree(lesson_root, ignore_errors=True)
+                lesson_root.mkdir()
+                try:
+                    # Lessons write shared store files through this link straight into dist/_assets
+                    (DIST_ROOT / ASSET_STORE).mkdir(exist_ok=True)
+                    os.symlink(os.path.join("..", ASSET_STORE), lesson_root / ASSET_STORE, target_is_directory=True)
+                except OSError:
+                    log("Symlinks unavailable: building the lesson in place.", "[WARN]")
+                    shutil.rmtree(lesson_root, ignore_errors=True)
+                    lesson_root = None
+                for folder in targets if lesson_root is not None else ():
+                    live = DIST_ROOT / folder
+                    if incremental and live.is_dir():
+                        shutil.copytree(live, lesson_root / folder, symlinks=True, copy_function=_link_or_copy)
+                    staging.append((lesson_root / folder, live))
+                    log(f"Staging {folder}/", "[STAGE]")
+                if not incremental:
+                    manifest = forced_manifest(manifest, targets)
+            elif not incremental:
+                manifest = forced_manifest(manifest, targets)
+                if not targets:
+                    clean_dir(DIST_ROOT)
+                    log("Cleaned dist directory (Full Build).", "[CLEAN]")
+                for folder in targets:
+                    target_dist = DIST_ROOT / folder
+                    if target_dist.exists():
+                        try:
+                            shutil.rmtree(target_dist, ignore_errors=True)
+                        except:
+                            clean_dir(target_dist)
+                    target_dist.mkdir(parents=True, exist_ok=True)
+                    log(f"Cleaned target dist: {folder}", "[CLEAN]")
+            if incremental:
+                log(f"Incremental build ({len(manifest.entries)} outputs in manifest).", "[CLEAN]")
+
+        profile.output_roots = [lesson_root, root, DIST_ROOT]
+
+        # 2. Copy Shared Reveal.js Engine
+        with profile.stage("engine"):
+            log("Copying shared Reveal.js engine...", "[ENGINE]")
+            for folder in ENGINE_FOLDERS:
+                src = ENGINE_ROOT / folder
+                dest = root / folder
+                if src.exists():
+                    copy_filtered(src, dest, manifest=manifest, strategy=strategy)
+                    log(f"Copied {folder}/", "[OK]")
+                else:
+                    log(f"Warning: {folder} not found in {ENGINE_ROOT}", "[WARN]")
+            if DECK_STYLESHEET.exists():
+                place_file(DECK_STYLESHEET, root / "css" / DECK_STYLESHEET.name, manifest, strategy)
+                log(f"Copied css/{DECK_STYLESHEET.name}", "[OK]")
+            if FACADE_SCRIPT.exists():
+                place_file(FACADE_SCRIPT, root / "js" / FACADE_SCRIPT.name, manifest, strategy)
+                log(f"Copied js/{FACADE_SCRIPT.name}", "[OK]")
+
+        # 3. Copy Shared Global Assets
+        with profile.stage("global assets"):
+            log("Copying shared global assets...", "[ASSETS]")
+            if GLOBAL_IMAGES.exists():
+                copy_filtered(GLOBAL_IMAGES, root / "images", manifest=manifest, strategy=strategy)
+                log("Copied root images/", "[OK]")
+
+        # 3.5 Fingerprint shared files so decks can reference immutable names
+        with profile.stage("fingerprint"):
+            if fingerprint:
+                options["fingerprints"] = fingerprint_shared(manifest, strategy)
+                write_asset_manifest(root, options["fingerprints"])
+                log(f"Fingerprinted {len(options['fingerprints'])} shared file(s) -> {ASSET_MANIFEST_NAME}", "[ASSETS]")
+
+        # 4. Process Lessons
+        with profile.stage("lessons"):
+            log("Aggregating presentations...", "[PROCESS]")
+            if targets:
+                lessons_to_process = targets
+            else:
+                lessons_to_process = sorted(d.name for d in INPUTS_DIR.iterdir() if d.is_dir())
+
+            results = run_lessons(lessons_to_process, manifest, jobs, options, dist_root=lesson_root)
+            for result in results:
+                manifest.merge_lesson(result["folder"], result["entries"], result["touched"], result["sources"])
+            report_lessons(results)
+            profile.add_lessons(results)
+            if options["dedupe"]:
+                report_dedupe(results)
+
+        # 4.5 Remove outputs whose inputs have gone away
+        with profile.stage("prune"):
+            if incremental:
+                if not targets:
+                    removed = manifest.prune()
+                else:
+                    removed = manifest.prune(list(SHARED_FOLDERS))
+                    removed += manifest.prune(targets, root=lesson_root)
+                if removed:
+                    log(f"Removed {removed} stale output(s).", "[CLEAN]")
+
+        # 4.6 Swap the staged lessons in before the manifest that describes them is saved
+        if staging and targets:
+            if compress:
+                with profile.stage("compress"):
+                    for staged_dir, live in staging:
+                        precompress(staged_dir, jobs, manifest, prefix=live.relative_to(DIST_ROOT).as_posix())
+            with profile.stage("swap"):
+                while staging:
+                    staged_dir, live = staging[0]
+                    if staged_dir.exists():  # Else nothing was built (no such lesson): live stays as it is
+                        try:
+                            old = swap_in(staged_dir, live)
+                        except OSError as e:
+                            return swap_failed(results, [pending.name for _, pending in staging], e, manifest)
+                        if old:
+                            shutil.rmtree(old, ignore_errors=True)
+                    staging.pop(0)
+                log(f"Swapped in {', '.join(targets)}", "[STAGE]")
+        manifest.save()
+
+        # 5. Update Dashboard
+        with profile.stage("dashboard"):
+            update_dashboard(root)
+
+        # 5.5 Precompressed sidecars for text outputs, before anything goes live
+        if compress:
+            with profile.stage("compress"):
+                written, removed = precompress(root, jobs, manifest)
+                log(f"Precompressed {written} sidecar(s) ({', '.join(sidecar_encodings())}), removed {removed} stale.",
+                    "[COMPRESS]")
+                manifest.save()  # Keeps the sidecars that don't pay
+
+        # 6. Swap the staged library in
+        if staging:
+            with profile.stage("swap"):
+                try:
+                    old = swap_in(*staging[-1])
+                except OSError as e:
+                    return swap_failed(results, [], e, manifest)
+                staging.pop()
+                if old:
+                    shutil.rmtree(old, ignore_errors=True)
+                log("Swapped in staged dist/.", "[STAGE]")
+    finally:
+        for staged_dir, _ in staging:
+            shutil.rmtree(staged_dir, ignore_errors=True)
+        if staging:
+            log("Build aborted: live dist/ left untouched.", "[ERROR]")
+        if lesson_root is not None:
+            shutil.rmtree(lesson_root, ignore_errors=True)
     log("Build complete!", "[DONE]")
+    return results
+
+# --- Watch mode (build.py --watch) ---
+SKILL_ROOT = PROJECT_ROOT / "skills" / "creating-html-presentation"
+WATCH_DEBOUNCE = 0.3             # Seconds of quiet that end a burst of saves
+WATCH_POLL_INTERVAL = 0.5        # Polling fallback when watchdog isn't installed
+ALL_LESSONS = "*"
+
+def watch_roots():
+    return [INPUTS_DIR, GLOBAL_IMAGES, PROJECT_ROOT / "audio", PROJECT_ROOT / "js",
+            SKILL_ROOT / "templates", SKILL_ROOT / "js", DECK_STYLESHEET.parent, ENGINE_ROOT]
+
+def plan_rebuild(paths):
+    """
+    Work out what a set of changed paths affects: lessons to regenerate from
+    presentation.json, lessons to rebuild into dist/, and whether shared files changed.
+    ALL_LESSONS stands for every lesson.
+    """
+    plan = {"generate": set(), "build": set(), "full": False}
+
+    def inside(path, root):
+        return root == path or root in path.parents
+
+    for path in paths:
+        path = Path(path)
+        if (inside(path, ENGINE_ROOT) or inside(path, GLOBAL_IMAGES) or inside(path, DECK_STYLESHEET.parent)
+                or path == FACADE_SCRIPT):
+            plan["full"] = True
+        elif inside(path, SKILL_ROOT / "templates") or inside(path, PROJECT_ROOT / "audio"):
+            plan["generate"].add(ALL_LESSONS)  # Every generated deck renders (or copies) these
+        elif inside(path, PROJECT_ROOT / "js") or inside(path, SKILL_ROOT / "js"):
+            plan["build"].add(ALL_LESSONS)  # slide-components.js decides which audio every deck ships
+        elif inside(path, INPUTS_DIR) and path != INPUTS_DIR:
+            parts = path.relative_to(INPUTS_DIR).parts
+            lesson = parts[0]
+            generated = (INPUTS_DIR / lesson / "presentation.json").exists()
+            if len(parts) == 1:
+                plan["build"].add(lesson)  # Lesson added or removed
+            elif parts[1] == "presentation.json":
+                plan["generate"].add(lesson)
+            elif parts[1] == "published":
+                if not generated:
+                    plan["build"].add(lesson)  # Otherwise it is our own generator output
+            elif parts[1] in ("images", "audio"):
+                plan["generate" if generated else "build"].add(lesson)
+            elif parts[1] == "index.html" and len(parts) == 2:
+                plan["build"].add(lesson)
+    return plan
+
+class PollingWatcher:
+    """Stat-snapshot watcher; a full scan of the watched trees takes a few milliseconds."""
+
+    def __init__(self, roots, interval=WATCH_POLL_INTERVAL):
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        found = {}
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != '__pycache__']
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    found[path] = (st.st_size, st.st_mtime_ns)
+        return found
+
+    def wait(self, timeout=None):
+        """Block until something changes (or timeout passes); returns the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else max(0, min(self.interval, deadline - time.monotonic())))
+            current = self.scan()
+            changed = {p for p in current.keys() | self.snapshot.keys() if current.get(p) != self.snapshot.get(p)}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+class EventWatcher:
+    """inotify/FSEvents/ReadDirectoryChanges through the optional watchdog package."""
+
+    def __init__(self, roots):
+        import queue
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+
+        self.events = queue.Queue()
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ('opened', 'closed_no_write'):
+                    return
+                watcher.events.put(event.src_path)
+                if getattr(event, 'dest_path', None):
+                    watcher.events.put(event.dest_path)
+
+        self.observer = Observer()
+        for root in roots:
+            if root.exists():
+                self.observer.schedule(Handler(), str(root), recursive=True)
+        self.observer.start()
+
+    def wait(self, timeout=None):
+        import queue
+        try:
+            changed = {self.events.get(timeout=timeout)}
+        except queue.Empty:
+            return set()
+        while not self.events.empty():
+            changed.add(self.events.get_nowait())
+        return {p for p in changed if not any(part.startswith('.') for part in Path(p).parts[-2:])}
+
+    def close(self):
+        self.observer.stop()
+        self.observer.join()
+
+def make_watcher(roots):
+    try:
+        watcher = EventWatcher(roots)
+        log("Using filesystem events (watchdog).", "[WATCH]")
+        return watcher
+    except ImportError:
+        log(f"watchdog not installed: polling every {WATCH_POLL_INTERVAL}s.", "[WATCH]")
+        return PollingWatcher(roots)
+
+def load_generator():
+    """The deck generator module, imported once so its Jinja environment stays warm."""
+    scripts = str(SKILL_ROOT / "scripts")
+    if scripts not in sys.path:
+        sys.path.insert(0, scripts)
+    import generate_presentation
+    return generate_presentation
+
+def watch(jobs=1, debounce=WATCH_DEBOUNCE, **build_options):
+    """
+    Rebuild on change until interrupted. Bursts of saves are debounced, only the lessons a
+    change affects are regenerated and rebuilt, and the Jinja environment and the build
+    manifest stay in memory between rebuilds.
+    """
+    try:
+        generator = load_generator()
+        env = generator.create_environment()
+    except ImportError as e:
+        log(f"Deck generator unavailable ({e}): presentation.json changes won't be rendered.", "[WARN]")
+        generator = env = None
+
+    build(jobs=jobs, **build_options)
+    manifest = BuildManifest(DIST_ROOT)
+    manifest.load()
+    watcher = make_watcher(watch_roots())
+    log("Watching inputs/, images/, audio/, js/ and the deck templates (Ctrl+C to stop)...", "[WATCH]")
+    try:
+        while True:
+            changed = watcher.wait()
+            while changed:
+                more = watcher.wait(timeout=debounce)
+                if not more:
+                    break
+                changed |= more
+            plan = plan_rebuild(changed)
+            if not (plan["generate"] or plan["build"] or plan["full"]):
+                continue
+            first = os.path.relpath(sorted(changed)[0], PROJECT_ROOT)
+            log(f"Changed: {first}" + (f" (+{len(changed) - 1} more)" if len(changed) > 1 else ""), "[WATCH]")
+
+            start = time.perf_counter()
+            lessons = sorted(d.name for d in INPUTS_DIR.iterdir() if d.is_dir())
+            generate = lessons if ALL_LESSONS in plan["generate"] else sorted(plan["generate"])
+            generate = [l for l in generate if (INPUTS_DIR / l / "presentation.json").exists()]
+            if generator is not None and generate:
+                paths = [str(INPUTS_DIR / lesson / "presentation.json") for lesson in generate]
+                for path, error, _ in generator.generate_many(paths, jobs, env=env):
+                    if error:
+                        log(f"{Path(path).parent.name}: generation failed: {error}", "[ERROR]")
+
+            try:
+                if plan["full"]:
+                    build(jobs=jobs, **build_options)
+                    manifest = BuildManifest(DIST_ROOT)
+                    manifest.load()
+                    what = "library"
+                else:
+                    targets = lessons if ALL_LESSONS in plan["build"] else sorted(plan["build"] | set(generate))
+                    targets = [l for l in targets if (INPUTS_DIR / l).is_dir() or (DIST_ROOT / l).is_dir()]
+                    if not targets:
+                        continue
+                    build(targets, jobs=jobs, manifest=manifest, **build_options)
+                    what = ", ".join(targets) if len(targets) <= 3 else f"{len(targets)} lessons"
+            except Exception as e:
+                log(f"Rebuild failed: {type(e).__name__}: {e}", "[ERROR]")
+                manifest = BuildManifest(DIST_ROOT)
+                manifest.load()
+                continue
+            log(f"Rebuilt {what} in {time.perf_counter() - start:.2f}s", "[WATCH]")
+    except KeyboardInterrupt:
+        log("Stopped watching.", "[WATCH]")
+    finally:
+        watcher.close()
 
 if __name__ == "__main__":
-    target = sys.argv[1] if len(sys.argv) > 1 else None
-    build(target)
+    parser = argparse.ArgumentParser(description="Aggregate lessons from inputs/ into dist/")
+    parser.add_argument("target", nargs="*", help="Build only these lesson folders (targeted build)")
+    parser.add_argument("--force", action="store_true", help="Ignore the build manifest and rebuild from scratch")
+    parser.add_argument("-j", "--jobs", type=int, nargs="?", const=0, default=1,
+                        help="Process lessons in N worker processes (no value or 0 = one per CPU core)")
+    parser.add_argument("--link-mode", choices=('auto',) + MATERIALIZE_STRATEGIES, default='auto',
+                        help="How assets are placed in dist/ (default: reflink/hardlink where supported, else copy)")
+    parser.add_argument("--no-dedupe", action="store_true",
+                        help=f"Copy assets into each lesson instead of the shared {ASSET_STORE}/ store")
+    parser.add_argument("--no-fingerprint", action="store_true",
+                        help="Keep stable names for engine/global files instead of content-hashed ones")
+    parser.add_argument("--no-optimize-images", action="store_true",
+                        help="Ship lesson images as-is instead of resized WebP/AVIF variants")
+    parser.add_argument("--in-place", action="store_true",
+                        help="Write straight into dist/ instead of staging the build and swapping it in")
+    parser.add_argument("--no-precompress", action="store_true",
+                        help="Skip writing .gz/.br sidecars for text files in dist/")
+    parser.add_argument("--copy-all-assets", action="store_true",
+                        help="Also ship lesson images/audio that the deck never references")
+    parser.add_argument("--report-orphans", action="store_true",
+                        help="List lesson images/audio that the deck never references")
+    parser.add_argument("--profile", nargs="?", const="build-profile.json", metavar="PATH",
+                        help="Print per-stage timing/I/O and write it as JSON (default: build-profile.json)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and rebuild the lessons affected by each change")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check that every output in dist/ still matches its source, then exit")
+    args = parser.parse_args()
+    if args.verify:
+        problems = verify_dist()
+        for problem in problems:
+            log(problem, "[ERROR]")
+        log("dist/ matches its sources." if not problems else f"{len(problems)} problem(s) found.", "[VERIFY]")
+        sys.exit(1 if problems else 0)
+    if args.watch:
+        watch(jobs=args.jobs, strategy=args.link_mode, dedupe=not args.no_dedupe,
+              fingerprint=not args.no_fingerprint, optimize_images=not args.no_optimize_images,
+              copy_all_assets=args.copy_all_assets, staged=not args.in_place, compress=not args.no_precompress)
+        sys.exit(0)
+    profile = BuildProfile()
+    results = build(args.target, force=args.force, jobs=args.jobs, strategy=args.link_mode,
+                    dedupe=not args.no_dedupe, fingerprint=not args.no_fingerprint,
+                    optimize_images=not args.no_optimize_images, copy_all_assets=args.copy_all_assets,
+                    staged=not args.in_place, compress=not args.no_precompress, profile=profile)
+    if args.report_orphans:
+        report_orphans(results)
+    if args.profile:
+        profile.print_table()
+        data = profile.as_dict(target=args.target, jobs=args.jobs, force=args.force)
+        Path(args.profile).write_text(json.dumps(data, indent=2), encoding='utf-8')
+        log(f"Profile written to {args.profile}", "[PROFILE]")
+    sys.exit(1 if any(r["status"] == "error" for r in results) else 0)
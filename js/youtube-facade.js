@@ -0,0 +1,97 @@
+/**
+ * <youtube-facade src="https://www.youtube.com/embed/ID?start=..&end=..">
+ * Shows the clip's poster; YouTube's ~1 MB player is only created once its slide is current
+ * (or on click) and is removed again when the slide is left, which also stops playback.
+ *
+ * The one definition of the element and its styles: generated decks load it from base.html
+ * (build.py ships it as dist/js/youtube-facade.js), slide-components.js loads it when
+ * <slide-media> needs it. The accent follows the deck's --primary where one is set.
+ */
+const YOUTUBE_FACADE_STYLES = `
+    youtube-facade {
+        display: block;
+        position: relative;
+        aspect-ratio: 16 / 9;
+        background: #000;
+        border: 2px solid var(--primary, #FFD700);
+        cursor: pointer;
+    }
+    youtube-facade img,
+    youtube-facade iframe {
+        position: absolute;
+        top: 0; left: 0;
+        width: 100%; height: 100%;
+        max-width: none; max-height: none;
+        margin: 0;
+        border: 0;
+        object-fit: cover;
+    }
+    .youtube-facade-play {
+        position: absolute;
+        top: 50%; left: 50%;
+        transform: translate(-50%, -50%);
+        width: 90px; height: 90px;
+        border: none;
+        border-radius: 50%;
+        background: var(--primary, #FFD700);
+        color: black;
+        font-size: 36px;
+        cursor: pointer;
+    }
+`;
+
+class YouTubeFacade extends HTMLElement {
+    connectedCallback() {
+        if (this.poster) return;
+        const id = (this.getAttribute('src') || '').match(/\/embed\/([\w-]+)/);
+        this.poster = `
+            <img src="https://i.ytimg.com/vi/${id ? id[1] : ''}/hqdefault.jpg" alt="" loading="lazy">
+            <button class="youtube-facade-play" aria-label="Play video"><i class="fas fa-play"></i></button>
+        `;
+        this.innerHTML = this.poster;
+        this.onclick = (e) => {
+            e.stopPropagation();
+            this.activate(true);
+        };
+    }
+
+    activate(autoplay) {
+        if (this.querySelector('iframe')) return;
+        const src = this.getAttribute('src');
+        const iframe = document.createElement('iframe');
+        iframe.src = src + (src.includes('?') ? '&' : '?') + 'enablejsapi=1' + (autoplay ? '&autoplay=1' : '');
+        iframe.title = this.getAttribute('title') || 'YouTube video';
+        iframe.allow = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share; fullscreen';
+        iframe.referrerPolicy = 'strict-origin-when-cross-origin';
+        iframe.allowFullscreen = true;
+        this.replaceChildren(iframe);
+    }
+
+    reset() {
+        if (this.querySelector('iframe')) this.innerHTML = this.poster;
+    }
+}
+
+if (!customElements.get('youtube-facade')) {
+    customElements.define('youtube-facade', YouTubeFacade);
+
+    // First in <head>, so a deck's own stylesheets can still restyle the facade
+    const facadeStyles = document.createElement('style');
+    facadeStyles.textContent = YOUTUBE_FACADE_STYLES;
+    document.head.prepend(facadeStyles);
+
+    // YouTube players exist only on the current slide. Reveal may load after this script
+    // (library decks load their components in <head>) or be running already (loaded on demand).
+    const syncYouTubeFacades = (event) => {
+        if (event.previousSlide) event.previousSlide.querySelectorAll('youtube-facade').forEach((f) => f.reset());
+        if (event.currentSlide) event.currentSlide.querySelectorAll('youtube-facade').forEach((f) => f.activate(false));
+    };
+    const watchSlides = () => {
+        if (!window.Reveal) return false;
+        Reveal.on('ready', syncYouTubeFacades);
+        Reveal.on('slidechanged', syncYouTubeFacades);
+        if (Reveal.isReady()) syncYouTubeFacades({ currentSlide: Reveal.getCurrentSlide() });
+        return true;
+    };
+    if (!watchSlides()) document.addEventListener('DOMContentLoaded', watchSlides, { once: true });
+}
@@ -7,16 +7,73 @@ This script eliminates the need for manual multi-file edits by:
 2. Automatically regenerating published HTML
 3. Rebuilding dist version
 
-Usage: python scripts/fast_edit.py <lesson_name> [--no-rebuild]
+Both steps are sent to the render server (scripts/render_server.py), which keeps
+templates and the build manifest warm; it is started in the background on first
+use. With --no-daemon, or if it can't be reached, the old child processes are used.
+
+Usage: python scripts/fast_edit.py <lesson_name> [--no-rebuild] [--validate] [--no-daemon]
 Example: python scripts/fast_edit.py 05-02-2026-Gold-Infographic-B1
 """
 
 import os
 import sys
+import json
 import subprocess
 import argparse
 import webbrowser
 import time
+import urllib.request
+import urllib.error
+
+RENDER_SERVER_URL = f"http://127.0.0.1:{os.environ.get('RENDER_SERVER_PORT', '8765')}"
+RENDER_SERVER_STARTUP_TIMEOUT = 15  # seconds
+
+def call_render_server(action, payload=None, timeout=600):
+    """POST (or GET /health) to the render server. Returns the JSON body, or None if unreachable."""
+    data = None if payload is None else json.dumps(payload).encode('utf-8')
+    request = urllib.request.Request(f"{RENDER_SERVER_URL}/{action}", data=data,
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read() or b'{}') or {"ok": False, "error": str(e)}
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+
+def ensure_render_server(project_root):
+    """Make sure a render server for this project is running; start one if needed."""
+    health = call_render_server('health', timeout=2)
+    if health:
+        return os.path.normcase(health.get('root', '')) == os.path.normcase(project_root)
+
+    log_dir = os.path.join(project_root, '.cache')
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = open(os.path.join(log_dir, 'render_server.log'), 'ab')
+    detach = {'creationflags': 0x00000008} if os.name == 'nt' else {'start_new_session': True}  # DETACHED_PROCESS
+    subprocess.Popen([sys.executable, os.path.join(project_root, 'scripts', 'render_server.py')],
+                     stdout=log_file, stderr=log_file, stdin=subprocess.DEVNULL, cwd=project_root, **detach)
+    print("[*] Starting render server...")
+    deadline = time.time() + RENDER_SERVER_STARTUP_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(0.2)
+        if call_render_server('health', timeout=1):
+            return True
+    return False
+
+def run_step(action, payload, label):
+    """Run one step on the render server and print its log. Returns True on success."""
+    body = call_render_server(action, payload)
+    if body is None:
+        print(f"[X] Render server stopped responding during {label}")
+        return False
+    if body.get('output'):
+        print(body['output'].strip())
+    if not body.get('ok'):
+        print(f"[X] Error {label}: {body.get('error') or body.get('errors') or 'failed'}")
+        return False
+    print(f"[*] {label[0].upper() + label[1:]} took {body.get('seconds', 0):.2f}s")
+    return True
 
 def main():
     # Ensure server is running
@@ -30,6 +87,8 @@ def main():
     parser.add_argument('lesson_name', help='Name of the lesson folder')
     parser.add_argument('--no-rebuild', action='store_true', help='Skip rebuilding dist')
     parser.add_argument('--open', action='store_true', help='Open the presentation in the browser')
+    parser.add_argument('--validate', action='store_true', help='Check presentation.json against the schema first')
+    parser.add_argument('--no-daemon', action='store_true', help='Run generate/build as child processes')
     
     args = parser.parse_args()
     
@@ -50,9 +109,53 @@ def main():
         return False
     
     print(f"[!] Fast Edit starting for: {lesson_name}")
-    
+
+    use_daemon = not args.no_daemon and ensure_render_server(project_root)
+    if not use_daemon and not args.no_daemon:
+        print("[!] Render server unavailable; using child processes.")
+
+    if args.validate:
+        print("\n[*] Validating presentation.json...")
+        if use_daemon:
+            if not run_step('validate', {'lesson': lesson_name}, 'validating'):
+                return False
+        elif subprocess.run([sys.executable, os.path.join(scripts_dir, 'validate_presentation.py'), inputs_dir]).returncode:
+            return False
+
     # Step 1: Generate HTML from JSON
     print("\n[*] Generating HTML from presentation.json...")
+    if use_daemon:
+        if not run_step('generate', {'lesson': lesson_name}, 'generating HTML'):
+            return False
+    elif not generate_with_subprocess(project_root, json_path):
+        return False
+    
+    if args.no_rebuild:
+        print("\n[*] Fast Edit complete! Skipping dist rebuild.")
+        print(f"[*] Published HTML: {os.path.join(inputs_dir, 'published', 'index.html')}")
+        return True
+    
+    # Step 2: Rebuild dist
+    print("\n[*] Rebuilding dist...")
+    if use_daemon:
+        if not run_step('build', {'lessons': [lesson_name]}, 'building dist'):
+            return False
+    elif not build_with_subprocess(project_root, lesson_name):
+        return False
+
+    print("\n[*] Fast Edit complete!")
+    print(f"[*] Dist location: {os.path.join(project_root, 'dist', lesson_name)}")
+    
+    url = f"http://127.0.0.1:8000/{lesson_name}/"
+    print(f"[*] URL: {url}")
+    
+    if args.open:
+        print(f"[*] Opening browser: {url}")
+        webbrowser.open(url)
+    
+    return True
+
+def generate_with_subprocess(project_root, json_path):
     generate_cmd = [
         sys.executable, 
         os.path.join(project_root, 'skills', 'creating-html-presentation', 'scripts', 'generate_presentation.py'),
@@ -69,13 +172,9 @@ def main():
             print(e.stderr.strip())
         return False
     
-    if args.no_rebuild:
-        print("\n[*] Fast Edit complete! Skipping dist rebuild.")
-        print(f"[*] Published HTML: {os.path.join(inputs_dir, 'published', 'index.html')}")
-        return True
-    
-    # Step 2: Rebuild dist
-    print("\n[*] Rebuilding dist...")
+    return True
+
+def build_with_subprocess(project_root, lesson_name):
     build_cmd = [
         sys.executable,
         os.path.join(project_root, 'build.py'),
@@ -95,16 +194,6 @@ def main():
             print(e.stderr.strip())
         return False
     
-    print("\n[*] Fast Edit complete!")
-    print(f"[*] Dist location: {os.path.join(project_root, 'dist', lesson_name)}")
-    
-    url = f"http://127.0.0.1:8000/{lesson_name}/"
-    print(f"[*] URL: {url}")
-    
-    if args.open:
-        print(f"[*] Opening browser: {url}")
-        webbrowser.open(url)
-    
     return True
 
 if __name__ == "__main__":
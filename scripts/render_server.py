@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Render Server - Keeps the presentation toolchain warm between edits
+
+Every fast_edit.py run used to start two fresh interpreters (generate, then build),
+re-importing Jinja, recompiling templates and re-reading the build manifest. This
+daemon does that once and then serves requests over a small local HTTP API:
+
+    GET  /health                          -> {"ok": true, "pid": ...}
+    POST /generate  {"lesson": "<name>"}  -> render inputs/<name>/presentation.json
+    POST /build     {"lessons": [...]}    -> targeted build.py build into dist/
+    POST /validate  {"lesson": "<name>"}  -> schema check of presentation.json
+    POST /shutdown
+    GET  /events?deck=<name>              -> Server-Sent Events for live reload
+
+Every response is JSON with "ok", "seconds" and the captured "output" log lines.
+Requests run one at a time (the build manifest and stdout capture are shared).
+
+Live reload: after each build the new dist/<lesson>/index.html is compared slide by
+slide with the previous one and only the changed <section> fragments are pushed
+("slides" event); the hook in base.html swaps them in place and keeps the current
+slide. Changes outside the slides (styles, scripts) or a different slide count send
+"reload" instead. The Caddyfile proxies /__live/ here so decks stay same-origin.
+
+Usage: python scripts/render_server.py [--port 8765]
+"""
+
+import os
+import re
+import sys
+import io
+import json
+import time
+import queue
+import argparse
+import threading
+import contextlib
+import importlib.util
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_PORT = int(os.environ.get("RENDER_SERVER_PORT", "8765"))
+EVENT_KEEPALIVE = 15  # seconds between SSE comments, so proxies keep the stream open
+
+SLIDES_START_RE = re.compile(r'<div class="slides">')
+SECTION_TAG_RE = re.compile(r'<(/?)section\b[^>]*>', re.IGNORECASE)
+
+# build.py resolves dist/ and inputs/ from the working directory
+os.chdir(PROJECT_ROOT)
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'skills', 'creating-html-presentation', 'scripts'))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import build
+import generate_presentation
+
+
+def load_script(name, path):
+    """Import a script by file path, whatever else on sys.path shares its module name."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# The deck generator's skill has an HTML checker of the same name; this is the schema validator
+validate_presentation = load_script("validate_presentation", os.path.join(SCRIPTS_DIR, "validate_presentation.py"))
+
+
+def split_slides(html):
+    """Split a deck into (text before the slides, [top-level <section> HTML], text after)."""
+    start = SLIDES_START_RE.search(html)
+    if not start:
+        return html, [], ""
+    sections, depth, opened, end = [], 0, None, start.end()
+    for tag in SECTION_TAG_RE.finditer(html, start.end()):
+        if not tag.group(1):
+            if depth == 0:
+                opened = tag.start()
+            depth += 1
+        elif depth:
+            depth -= 1
+            if depth == 0:
+                sections.append(html[opened:tag.end()])
+                end = tag.end()
+    return html[:start.end()], sections, html[end:]
+
+
+def slide_changes(old_html, new_html):
+    """('slides', {...}) with only the changed fragments, ('reload', {}) or None if identical."""
+    if old_html == new_html:
+        return None
+    old_head, old_slides, old_tail = split_slides(old_html or "")
+    new_head, new_slides, new_tail = split_slides(new_html)
+    if not new_slides or len(old_slides) != len(new_slides) or \
+            old_head != new_head or old_tail.strip() != new_tail.strip():
+        return "reload", {}
+    changed = {i: html for i, (old, html) in enumerate(zip(old_slides, new_slides)) if old != html}
+    return "slides", {"count": len(new_slides), "changed": changed}
+
+
+class RenderService:
+    """Warm state shared by all requests: Jinja environment, build manifest, schema."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.env = generate_presentation.create_environment()
+        self.reload_manifest()
+        self.schema = None
+        self.listeners = {}  # deck -> [queue of (event, data)]
+        self.listeners_lock = threading.Lock()
+
+    def subscribe(self, deck):
+        events = queue.Queue()
+        with self.listeners_lock:
+            self.listeners.setdefault(deck, []).append(events)
+        return events
+
+    def unsubscribe(self, deck, events):
+        with self.listeners_lock:
+            self.listeners.get(deck, []).remove(events)
+
+    def publish(self, deck, event, data):
+        with self.listeners_lock:
+            for events in self.listeners.get(deck, []):
+                events.put((event, data))
+
+    def deck_html(self, lesson):
+        try:
+            with open(os.path.join(build.DIST_ROOT, lesson, 'index.html'), encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def reload_manifest(self):
+        self.manifest = build.BuildManifest(build.DIST_ROOT)
+        self.manifest.load()
+
+    def lesson_json(self, lesson):
+        if not lesson or os.path.basename(lesson) != lesson:
+            raise FileNotFoundError(f"Not a lesson folder name: {lesson!r}")
+        path = os.path.join(build.INPUTS_DIR, lesson, 'presentation.json')
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Presentation not found: {path}")
+        return path
+
+    def generate(self, lesson, use_cache=True):
+        generate_presentation.generate_presentation(self.lesson_json(lesson), env=self.env, use_cache=use_cache)
+        return {}
+
+    def build(self, lessons, **options):
+        with self.listeners_lock:
+            watched = [l for l in lessons or list(self.listeners) if self.listeners.get(l)]
+        before = {lesson: self.deck_html(lesson) for lesson in watched}
+        try:
+            results = build.build(lessons or None, manifest=self.manifest if lessons else None, **options)
+        except Exception:
+            self.reload_manifest()  # The in-memory copy may be half-updated
+            raise
+        if not lessons:
+            self.reload_manifest()  # A full (staged) build saved a new manifest
+        pushed = {}
+        for lesson in watched:
+            after = self.deck_html(lesson)
+            change = slide_changes(before[lesson], after) if after is not None else None
+            if change:
+                self.publish(lesson, *change)
+                pushed[lesson] = change[0] if change[0] == "reload" else sorted(change[1]["changed"])
+        failed = [r for r in results if r["status"] == "error"]
+        return {"ok": not failed, "pushed": pushed, "lessons": {r["folder"]: r["status"] for r in results},
+                "errors": {r["folder"]: r["error"] for r in failed}}
+
+    def validate(self, lesson, strict=False):
+        if self.schema is None:
+            self.schema = validate_presentation.load_schema()
+        success, errors, warnings = validate_presentation.validate_file(self.lesson_json(lesson), self.schema, strict)
+        return {"ok": bool(success), "errors": errors, "warnings": warnings}
+
+    def handle(self, action, payload):
+        """Run one request with stdout captured; returns the JSON response body."""
+        out = io.StringIO()
+        start = time.perf_counter()
+        with self.lock, contextlib.redirect_stdout(out):
+            try:
+                if action == "generate":
+                    body = self.generate(payload.get("lesson"), payload.get("cache", True))
+                elif action == "build":
+                    lessons = payload.get("lessons") or ([payload["lesson"]] if payload.get("lesson") else [])
+                    body = self.build(lessons, **{k: payload[k] for k in ("force", "jobs") if k in payload})
+                elif action == "validate":
+                    body = self.validate(payload.get("lesson"), payload.get("strict", False))
+                else:
+                    return 404, {"ok": False, "error": f"Unknown action: {action}"}
+                body.setdefault("ok", True)
+                status = 200
+            except FileNotFoundError as e:
+                body, status = {"ok": False, "error": str(e)}, 404
+            except Exception as e:
+                body, status = {"ok": False, "error": f"{type(e).__name__}: {e}"}, 500
+        body.update(seconds=round(time.perf_counter() - start, 4), output=out.getvalue())
+        return status, body
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self.send_json(200, {"ok": True, "pid": os.getpid(), "root": PROJECT_ROOT})
+        elif url.path == "/events":
+            self.stream_events(parse_qs(url.query).get("deck", [""])[0])
+        else:
+            self.send_json(404, {"ok": False, "error": "Not found"})
+
+    def stream_events(self, deck):
+        """Hold the connection open and forward this deck's live-reload events."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        events = self.service.subscribe(deck)
+        try:
+            self.wfile.write(b": connected\n\n")
+            self.wfile.flush()
+            while True:
+                try:
+                    event, data = events.get(timeout=EVENT_KEEPALIVE)
+                    message = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+                except queue.Empty:
+                    message = ": keepalive\n\n"
+                self.wfile.write(message.encode('utf-8'))
+                self.wfile.flush()
+        except OSError:
+            pass  # Browser tab closed or navigated away
+        finally:
+            self.service.unsubscribe(deck, events)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json(400, {"ok": False, "error": "Request body must be JSON"})
+            return
+        action = self.path.strip("/")
+        if action == "shutdown":
+            self.send_json(200, {"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        self.send_json(*self.service.handle(action, payload))
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"[RENDER] {self.address_string()} {format % args}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local render daemon for fast_edit.py")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port on 127.0.0.1 (default {DEFAULT_PORT})")
+    args = parser.parse_args()
+
+    Handler.service = RenderService()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+    server.daemon_threads = True  # Open event streams must not block shutdown
+    print(f"[RENDER] Serving {PROJECT_ROOT} on http://127.0.0.1:{args.port} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
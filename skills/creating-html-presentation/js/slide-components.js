@@ -559,6 +559,16 @@ class SlideSplit extends HTMLElement {
     }
 }
 
+// <youtube-facade> is defined once, in youtube-facade.js (in the project's js/ folder),
+// and only fetched the first time a <slide-media> renders a YouTube clip
+const YOUTUBE_FACADE_SCRIPT = new URL('../../../js/youtube-facade.js', document.currentScript.src).href;
+function loadYouTubeFacade() {
+    if (customElements.get('youtube-facade') || document.querySelector(`script[src="${YOUTUBE_FACADE_SCRIPT}"]`)) return;
+    const script = document.createElement('script');
+    script.src = YOUTUBE_FACADE_SCRIPT;
+    document.head.appendChild(script);
+}
+
 /**
  * <slide-media title="" type="video|audio" src="">
  * Media wrapper with proper aspect ratio handling (Gold Standard Pattern)
@@ -571,8 +581,11 @@ class SlideMedia extends HTMLElement {
 
         let mediaHTML = '';
         if (type === 'video') {
-            // Use 16:9 video-wrapper for YouTube embeds
-            if (src.includes('youtube') || src.includes('youtu.be')) {
+            // YouTube embeds start as a poster facade (player loads on the current slide)
+            if (src.includes('youtube.com/embed/')) {
+                mediaHTML = `<youtube-facade src="${src}" title="${title}"></youtube-facade>`;
+                loadYouTubeFacade();
+            } else if (src.includes('youtube') || src.includes('youtu.be')) {
                 mediaHTML = `
                     <div class="video-wrapper">
                         <iframe src="${src}" frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share; fullscreen" referrerpolicy="strict-origin-when-cross-origin" allowfullscreen playsinline></iframe>
@@ -1,71 +1,523 @@
 
 import os
 import base64
+import hashlib
+import json
+import mimetypes
 import re
+import sys
+import zlib
 from pathlib import Path
+from urllib.parse import unquote
 
-def get_base64_image(image_path):
-    with open(image_path, "rb") as image_file:
-        encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
-        ext = os.path.splitext(image_path)[1].lower().replace('.', '')
-        if ext == 'jpg': ext = 'jpeg'
-        return f"data:image/{ext};base64,{encoded_string}"
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
 
-def bundle_html(input_file, output_file):
+try:
+    import brotli  # fontTools needs it to write woff2
+except ImportError:
+    brotli = None
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:
+    TTFont = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+# One pass over the deck finds everything the bundler touches (the match's lastgroup is its kind):
+#   css     - stylesheets to inline (also the style preloads older decks used for deck.css)
+#   js      - local scripts to inline
+#   preload - image preload hints, pointless once everything is inline
+#   source  - <picture> <source srcset> candidates; dropped when local, so the embedded <img> is used
+#   media   - slide backgrounds, <img>/<audio>/<video> sources, Reveal's lazy data-src, posters
+#   script / reveal / body_end - landmarks for placing the asset block
+TOKEN_RE = re.compile(r'''(?P<css><link rel="stylesheet" href="(?P<css_href>[^"]+)"(?P<css_attrs>[^>]*)>|<link rel="preload" href="(?P<preload_href>[^"]+)" as="style"[^>]*>)'''
+                      r'''|(?P<js><script src="(?P<js_src>[^"]+)"></script>)'''
+                      r'''|(?P<preload><link rel="preload" as="image"[^>]*>\s*)'''
+                      r'''|(?P<source><source\b[^>]*\bsrcset=(?P<sq>["'])(?P<srcset>[^"']+)(?P=sq)[^>]*>)'''
+                      r'''|(?P<media>(?<![\w-])(?P<attr>data-background(?:-image|-video)?|data-src|src|poster)=(?P<q>["'])(?P<path>[^"']+)(?P=q))'''
+                      r'''|(?P<script><script\b)|(?P<reveal>class="reveal")|(?P<body_end></body>)''')
+BUNDLE_HASH_LEN = 16
+COPY_CHUNK_SIZE = 1024 * 1024
+BASE64_CHUNK_SIZE = 3 * 256 * 1024  # Multiple of 3: encoded chunks join without padding
+EMBED_MIME_PREFIXES = ('image/', 'audio/', 'video/', 'font/')
+
+# Stylesheets are resolved into self-contained copies: local @imports spliced in, url()s as
+# data: URIs, one woff2 source per @font-face. Copies are cached by content hash across runs.
+BUNDLE_CACHE = os.path.join(PROJECT_ROOT, '.cache', 'bundle')
+BUNDLE_CACHE_VERSION = "1"
+CSS_IMPORT_RE = re.compile(r'''@import\s+(?:url\(\s*(?P<q1>["']?)(?P<url>[^"')]+)(?P=q1)\s*\)|(?P<q2>["'])(?P<str>[^"']+)(?P=q2))\s*(?P<media>[^;]*);\s*''')
+CSS_URL_RE = re.compile(r'''url\(\s*(?P<q>["']?)(?P<ref>[^"')]+)(?P=q)\s*\)''')
+FONT_FACE_RE = re.compile(r'@font-face\s*\{[^}]*\}')
+FONT_SRC_RE = re.compile(r'\bsrc\s*:[^;}]*;?\s*')
+FONT_FORMATS = {'.woff2': 'woff2', '.woff': 'woff', '.ttf': 'truetype', '.otf': 'opentype'}  # Best first; .eot/.svg dropped
+LINK_ATTR_RE = re.compile(r'\s(?:id|media)="[^"]*"')
+
+# --optimize: smaller single-file decks for LINE or email. Images are re-encoded at projector
+# width, CSS/JS minified (rcssmin/rjsmin when installed) and HTML whitespace collapsed.
+OPTIMIZE_VERSION = "2"
+IMAGE_CACHE = os.path.join(PROJECT_ROOT, '.cache', 'images')  # build.py's variant cache, shared
+OPTIMIZE_IMAGE_WIDTH = 1280
+OPTIMIZE_JPEG_QUALITY = 80
+# Strings, url() and /*! license */ comments are copied verbatim; other comments are dropped
+CSS_VERBATIM_RE = re.compile(r'''"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\([^)]*\)|/\*!.*?\*/|(?P<comment>/\*.*?\*/)''', re.DOTALL)
+CSS_SPACE_RE = re.compile(r'\s*([{};,])\s*')
+SOURCE_MAP_RE = re.compile(r'^\s*//[#@] sourceMappingURL=\S+\s*$', re.MULTILINE)
+PRESERVED_HTML_RE = re.compile(r'(?P<open><(?P<tag>pre|textarea|script|style)\b[^>]*>)(?P<body>.*?)(?P<close></(?P=tag)>)', re.IGNORECASE | re.DOTALL)
+SCRIPT_TYPE_RE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+JS_TYPES = {'text/javascript', 'application/javascript', 'module'}
+HTML_SPACE_RE = re.compile(r'\s{2,}')
+
+# Resolves every data-bundle-<attr>="<hash>" to a blob: URL before Reveal reads the slides.
+# Blobs are made lazily and once per asset, however many slides use it.
+BUNDLE_LOADER = """<script>
+(function () {
+    const assets = JSON.parse(document.getElementById('bundle-assets').textContent);
+    const urls = {};
+    const blobUrl = (key) => {
+        if (!urls[key]) {
+            const bytes = Uint8Array.from(atob(assets[key][1]), (c) => c.charCodeAt(0));
+            urls[key] = URL.createObjectURL(new Blob([bytes], { type: assets[key][0] }));
+        }
+        return urls[key];
+    };
+    for (const attr of %s) {
+        document.querySelectorAll('[data-bundle-' + attr + ']').forEach((el) => {
+            el.setAttribute(attr, blobUrl(el.getAttribute('data-bundle-' + attr)));
+            el.removeAttribute('data-bundle-' + attr);
+        });
+    }
+})();
+</script>
+"""
+BUNDLE_ATTRS = ['data-background', 'data-background-image', 'data-background-video', 'data-src', 'src', 'poster']
+
+# --compressed: the finished bundle is gzipped into one base64 payload and unpacked in the browser
+# with DecompressionStream, then written over this shell; the usual loader then makes the blob: URLs.
+# gzip rather than brotli: DecompressionStream only takes gzip/deflate in the browsers we target.
+TITLE_RE = re.compile(r'<title>.*?</title>', re.IGNORECASE | re.DOTALL)
+GZIP_WBITS = 31  # zlib with a gzip header and trailer
+COMPRESSED_SHELL = ("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+%s
+</head>
+<body>
+<noscript>This presentation needs JavaScript.</noscript>
+<script type="application/octet-stream" id="bundle-payload">""", """</script>
+<script>
+(async function () {
+    if (!window.DecompressionStream) {
+        document.body.textContent = 'This browser cannot open compressed presentations. Please use a current Chrome, Edge, Firefox or Safari.';
+        return;
+    }
+    const bytes = Uint8Array.from(atob(document.getElementById('bundle-payload').textContent), (c) => c.charCodeAt(0));
+    const html = await new Response(new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'))).text();
+    document.open();
+    document.write(html);
+    document.close();
+})();
+</script>
+</body>
+</html>
+""")
+
+def asset_mime(path):
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+def base64_size(num_bytes):
+    return 4 * ((num_bytes + 2) // 3)
+
+def local_path(ref, base_dir):
+    """The file a relative reference points at, or None for remote, data:, fragment or missing targets."""
+    if ref.startswith(('data:', 'blob:', '#')) or '://' in ref or ref.startswith('//'):
+        return None
+    path = os.path.normpath(os.path.join(base_dir, unquote(ref.split('?')[0].split('#')[0])))
+    return path if os.path.isfile(path) else None
+
+def _size(num_bytes):
+    return f"{num_bytes / (1024 * 1024):.1f} MB" if num_bytes >= 1024 * 1024 else f"{num_bytes / 1024:.1f} KB"
+
+def file_key(path):
+    """Content hash of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:BUNDLE_HASH_LEN]
+
+def copy_text(path, out):
+    """Stream a text file into the binary output."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), ''):
+            out.write(chunk.encode('utf-8'))
+
+def write_base64(path, out):
+    """Base64 of a file straight from disk; chunks are multiples of 3 bytes so they concatenate."""
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(BASE64_CHUNK_SIZE), b''):
+            out.write(base64.b64encode(chunk))
+
+def write_asset_block(assets, out):
+    """The bundle-assets JSON ({hash: [mime, base64]}) and its loader, one asset at a time."""
+    out.write(b'<script type="application/json" id="bundle-assets">{')
+    for i, (key, (mime, media_path)) in enumerate(assets.items()):
+        out.write(f'{"," if i else ""}"{key}":["{mime}","'.encode('ascii'))
+        write_base64(media_path, out)
+        out.write(b'"]')
+    out.write(b'}</script>\n')
+    out.write((BUNDLE_LOADER % json.dumps(BUNDLE_ATTRS)).encode('utf-8'))
+
+def write_gzip_base64(path, out):
+    """Gzip a file and write it as base64, streaming; compressed bytes are encoded in multiples of 3."""
+    packer = zlib.compressobj(9, zlib.DEFLATED, GZIP_WBITS)
+    pending = b''
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+            pending += packer.compress(chunk)
+            cut = len(pending) - len(pending) % 3
+            out.write(base64.b64encode(pending[:cut]))
+            pending = pending[cut:]
+    out.write(base64.b64encode(pending + packer.flush()))
+
+def write_cached(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def woff2_font(path, resolved, cache_dir=BUNDLE_CACHE):
+    """The font as woff2: as-is if it already is one, converted (and cached) when fontTools can, else None."""
+    if path.endswith('.woff2'):
+        return path
+    if TTFont is None or brotli is None:
+        return None
+    key = ('woff2', path)
+    if key not in resolved:
+        out = os.path.join(cache_dir, f"{file_key(path)}.woff2")
+        if not os.path.exists(out):
+            font = TTFont(path)
+            font.flavor = 'woff2'
+            tmp = f"{out}.{os.getpid()}.tmp"
+            os.makedirs(cache_dir, exist_ok=True)
+            font.save(tmp)
+            os.replace(tmp, out)
+        resolved[key] = out
+    return resolved[key]
+
+def data_uri(path, resolved, mime=None):
+    key = ('uri', path)
+    if key not in resolved:
+        with open(path, 'rb') as f:
+            resolved[key] = f"data:{mime or asset_mime(path)};base64,{base64.b64encode(f.read()).decode('ascii')}"
+    return resolved[key]
+
+def font_source(block, css_dir, resolved):
+    """One src declaration for an @font-face rule: its best local font, as woff2 wherever possible."""
+    candidates = [local_path(m.group('ref'), css_dir) for m in CSS_URL_RE.finditer(''.join(FONT_SRC_RE.findall(block)))]
+    candidates = sorted({path for path in candidates if path and os.path.splitext(path)[1].lower() in FONT_FORMATS},
+                        key=lambda path: list(FONT_FORMATS).index(os.path.splitext(path)[1].lower()))
+    for path in candidates:
+        woff2 = woff2_font(path, resolved)
+        if woff2:
+            return f"src: url({data_uri(woff2, resolved, 'font/woff2')}) format('woff2');\n"
+    if candidates:
+        resolved['unconverted_fonts'] = True
+        return f"src: url({data_uri(candidates[0], resolved)}) format('{FONT_FORMATS[os.path.splitext(candidates[0])[1].lower()]}');\n"
+    return None
+
+def resolve_css(path, resolved, cache_dir=BUNDLE_CACHE, parents=()):
+    """
+    Path of a self-contained copy of a stylesheet. Each stylesheet is resolved once per run
+    (resolved: path -> copy) and the copy is reused across runs while the stylesheet and
+    everything it pulls in are unchanged. Remote @imports (Google Fonts in some Reveal themes)
+    are kept and hoisted to the top, so those still need a connection.
+    """
+    if path in resolved:
+        return resolved[path]
+    css_dir = os.path.dirname(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    # The cache key covers this file and the content of every local file it references
+    imports = {}
+    deps = []
+    for m in CSS_IMPORT_RE.finditer(text):
+        child = local_path(m.group('url') or m.group('str'), css_dir)
+        if child and child not in parents and child.endswith('.css'):
+            imports[child] = resolve_css(child, resolved, cache_dir, parents + (path,))
+            deps.append(os.path.basename(imports[child]))
+    for m in CSS_URL_RE.finditer(text):
+        dep = local_path(m.group('ref'), css_dir)
+        if dep and not dep.endswith('.css'):
+            deps.append(file_key(dep))
+    key = hashlib.sha256(json.dumps([BUNDLE_CACHE_VERSION, text, deps, TTFont is not None and brotli is not None])
+                         .encode('utf-8')).hexdigest()[:BUNDLE_HASH_LEN]
+    out = os.path.join(cache_dir, f"{key}.css")
+    if not os.path.exists(out):
+        remote = []
+
+        def splice(m):
+            child = local_path(m.group('url') or m.group('str'), css_dir)
+            if child in imports:
+                with open(imports[child], 'r', encoding='utf-8') as f:
+                    inner = f.read()
+                # The child's own remote @imports move up with ours
+                remote.extend(i.group(0).strip() for i in CSS_IMPORT_RE.finditer(inner))
+                inner = CSS_IMPORT_RE.sub('', inner)
+                media = m.group('media').strip()
+                return f"@media {media} {{\n{inner}\n}}\n" if media else inner + "\n"
+            if not child:
+                remote.append(m.group(0).strip())  # @import is only valid before other rules
+            return ''
+
+        def font_face(m):
+            src = font_source(m.group(0), css_dir, resolved)
+            if not src:
+                return m.group(0)
+            body = FONT_SRC_RE.sub('', m.group(0))
+            return body[:body.index('{') + 1] + '\n    ' + src + body[body.index('{') + 1:]
+
+        def embed(m):
+            dep = local_path(m.group('ref'), css_dir)
+            return f"url({data_uri(dep, resolved)})" if dep and not dep.endswith('.css') else m.group(0)
+
+        # Fonts first, so a face's unused formats are dropped before url()s are embedded
+        body = CSS_IMPORT_RE.sub(splice, CSS_URL_RE.sub(embed, FONT_FACE_RE.sub(font_face, text)))
+        write_cached(out, ('\n'.join(remote + [body])).encode('utf-8'))
+    resolved[path] = out
+    return out
+
+def minify_css(text):
+    if rcssmin is not None:
+        return rcssmin.cssmin(text, keep_bang_comments=True)
+    # Conservative fallback: comments and whitespace around braces, semicolons and commas,
+    # outside strings and url() only
+    parts, pos = [], 0
+    for m in CSS_VERBATIM_RE.finditer(text):
+        parts += [CSS_SPACE_RE.sub(r'\1', text[pos:m.start()]), '' if m.group('comment') else m.group(0)]
+        pos = m.end()
+    return ''.join(parts + [CSS_SPACE_RE.sub(r'\1', text[pos:])]).strip()
+
+def minify_js(text):
+    text = SOURCE_MAP_RE.sub('', text)  # Maps aren't bundled, so the reference only 404s
+    return rjsmin.jsmin(text, keep_bang_comments=True) if rjsmin is not None else text
+
+def collapse_html(html):
+    """
+    Runs of whitespace between and inside tags become one space (or newline). Inline styles
+    and scripts are minified like linked ones; <pre>, <textarea> and data blocks
+    (<script type="application/json"> and the like) are left alone.
+    """
+    def collapse(text):
+        return HTML_SPACE_RE.sub(lambda m: '\n' if '\n' in m.group(0) else ' ', text)
+    def inline(m):
+        tag, body = m.group('tag').lower(), m.group('body')
+        if tag == 'style':
+            body = minify_css(body)
+        elif tag == 'script' and 'src=' not in m.group('open').lower():
+            script_type = SCRIPT_TYPE_RE.search(m.group('open'))
+            if script_type is None or script_type.group(1).lower() in JS_TYPES:
+                body = minify_js(body)
+        return m.group('open') + body + m.group('close')
+    parts, pos = [], 0
+    for m in PRESERVED_HTML_RE.finditer(html):
+        parts += [collapse(html[pos:m.start()]), inline(m)]
+        pos = m.end()
+    return ''.join(parts + [collapse(html[pos:])])
+
+def minified(path, kind, cache_dir=BUNDLE_CACHE):
+    """Cached minified copy of a stylesheet or script, keyed by its content and the minifier used."""
+    minifier = {'css': minify_css, 'js': minify_js}[kind]
+    tool = {'css': rcssmin, 'js': rjsmin}[kind]
+    key = hashlib.sha256(f"{OPTIMIZE_VERSION}:{tool is not None}:{file_key(path)}".encode()).hexdigest()[:BUNDLE_HASH_LEN]
+    out = os.path.join(cache_dir, f"{key}.min.{kind}")
+    if not os.path.exists(out):
+        with open(path, 'r', encoding='utf-8') as f:
+            write_cached(out, minifier(f.read()).encode('utf-8'))
+    return out
+
+def load_build():
+    """build.py (project root) owns the image pipeline; only --optimize needs it, and Pillow with it."""
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    import build
+    return build
+
+def optimized_image(path, key, cache_dir=IMAGE_CACHE):
+    """
+    (mime, path) of a smaller encoding of a raster image: build.py's WebP variant at projector
+    width, or a JPEG when Pillow can't write WebP (opaque images only). None if nothing beats the original.
+    """
+    build = load_build()
+    if build.Image is None or os.path.splitext(path)[1].lower() not in build.RASTER_EXTENSIONS:
+        return None
+    candidate = None
+    if 'webp' in build.image_formats():
+        # Only the one variant the bundle embeds: no AVIF, no other widths
+        variants = build.image_variants(path, key, cache_dir, formats=('webp',), widths=(OPTIMIZE_IMAGE_WIDTH,))
+        candidate = ('image/webp', str(variants['webp'][-1][1]))
+    else:
+        out = os.path.join(cache_dir, f"{key}-{OPTIMIZE_IMAGE_WIDTH}.jpg")
+        if not os.path.exists(out):
+            with build.Image.open(path) as image:
+                if image.mode in ('RGBA', 'LA', 'P'):
+                    return None
+                image = image.convert('RGB')
+                if image.width > OPTIMIZE_IMAGE_WIDTH:
+                    image = image.resize((OPTIMIZE_IMAGE_WIDTH, round(image.height * OPTIMIZE_IMAGE_WIDTH / image.width)),
+                                         build.Image.LANCZOS)
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{out}.{os.getpid()}.tmp"
+                image.save(tmp, format='JPEG', quality=OPTIMIZE_JPEG_QUALITY, optimize=True, progressive=True)
+                os.replace(tmp, out)
+        candidate = ('image/jpeg', out)
+    return candidate if os.path.getsize(candidate[1]) < os.path.getsize(path) else None
+
+def local_srcset(srcset, base_dir):
+    """True if every candidate in a srcset list is a file next to the deck."""
+    urls = [candidate.split()[0] for candidate in srcset.split(',') if candidate.strip()]
+    return bool(urls) and all(local_path(url, base_dir) for url in urls)
+
+def bundle_html(input_file, output_file, optimize=False, compressed=False):
+    """
+    Inline a deck's stylesheets, scripts and media into one HTML file. The page is tokenized
+    once and written out piece by piece; inlined files and media are streamed from disk, so
+    memory stays at roughly the size of the deck's own HTML whatever the media adds up to.
+    optimize re-encodes raster images and minifies the page, its stylesheets and scripts;
+    every step is cached by source hash, so re-bundling an unchanged deck is quick.
+    compressed wraps the result in a self-extracting gzip shell (see COMPRESSED_SHELL).
+    """
     base_dir = os.path.dirname(input_file)
     with open(input_file, 'r', encoding='utf-8') as f:
         content = f.read()
+    if optimize:
+        content = collapse_html(content)
+
+    def local_file(ref):
+        return local_path(ref, base_dir)
+
+    # 1. Tokenize: what to inline, which media to embed, and where the asset block goes
+    tokens = list(TOKEN_RE.finditer(content))
+    resolved = {}       # stylesheet path -> self-contained copy (plus fonts and data: URIs it embeds)
+    inlined = {}        # stylesheet/script path -> the file actually written (minified with optimize)
+    assets = {}         # content hash -> (mime, path)
+    keys = {}           # resolved path -> content hash, so each file is hashed once
+    references = 0
+    naive_size = len(content.encode('utf-8'))  # Had every reference been inlined as its own data: URI
+    block_at = None
+    seen_reveal = False
+    for token in tokens:
+        kind = token.lastgroup
+        if kind == 'css':
+            stylesheet = local_file(token.group('css_href') or token.group('preload_href'))
+            if stylesheet:
+                naive_size += os.path.getsize(resolve_css(stylesheet, resolved))
+                inlined[stylesheet] = minified(resolved[stylesheet], 'css') if optimize else resolved[stylesheet]
+        if kind == 'js' and local_file(token.group('js_src')):
+            script = local_file(token.group('js_src'))
+            naive_size += os.path.getsize(script)
+            inlined[script] = minified(script, 'js') if optimize else script
+        if kind == 'reveal':
+            seen_reveal = True
+        if kind in ('js', 'script') and seen_reveal and block_at is None:
+            block_at = token.start()
+        elif kind == 'body_end' and block_at is None:
+            block_at = token.start()
+        elif kind == 'media':
+            media_path = local_file(token.group('path'))
+            if media_path and asset_mime(media_path).startswith(EMBED_MIME_PREFIXES):
+                if media_path not in keys:
+                    keys[media_path] = file_key(media_path)
+                    assets.setdefault(keys[media_path], (asset_mime(media_path), media_path))
+                references += 1
+                naive_size += (len(f"data:{asset_mime(media_path)};base64,")
+                               + base64_size(os.path.getsize(media_path)) - len(token.group('path')))
+    if block_at is None:
+        block_at = len(content)
+    reencoded = 0
+    if optimize:
+        for key, (mime, media_path) in assets.items():
+            smaller = optimized_image(media_path, key)
+            if smaller:
+                assets[key] = smaller
+                reencoded += 1
 
-    # 1. Inline CSS
-    def replace_css(match):
-        href = match.group(1)
-        css_path = os.path.join(base_dir, href)
-        if os.path.exists(css_path):
-            with open(css_path, 'r', encoding='utf-8') as f:
-                return f'<style>\n{f.read()}\n</style>'
-        return match.group(0)
-    
-    content = re.sub(r'<link rel="stylesheet" href="([^"]+)">', replace_css, content)
-
-    # 2. Inline Scripts
-    def replace_js(match):
-        src = match.group(1)
-        js_path = os.path.join(base_dir, src)
-        if os.path.exists(js_path):
-            with open(js_path, 'r', encoding='utf-8') as f:
-                return f'<script>\n{f.read()}\n</script>'
-        return match.group(0)
-
-    content = re.sub(r'<script src="([^"]+)"></script>', replace_js, content)
-
-    # 3. Inline Images (data-background-image and img src)
-    def replace_image(match):
-        img_src = match.group(1)
-        img_path = os.path.join(base_dir, img_src)
-        if os.path.exists(img_path):
-            b64 = get_base64_image(img_path)
-            return match.group(0).replace(img_src, b64)
-        return match.group(0)
-
-    # Link format: data-background-image="images/foo.png" or src="images/foo.png"
-    content = re.sub(r'data-background-image="([^"]+)"', replace_image, content)
-    content = re.sub(r'src="([^"]+)"', replace_image, content)
-
-    # Fix font paths if any (Reveal often references fonts in themes)
-    # Simple fix for Monokai or Theme fonts -> usually not an issue with simple themes, checking...
-    # The 'black.css' theme imports fonts from Google Fonts usually, which requires internet.
-    # Offline fonts are trickier, but for now we focus on local files.
-
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    # 2. Stream the output: HTML between tokens as-is, tokens replaced by their inlined form
+    tmp = f"{output_file}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as out:
+        pos, block_written = 0, not assets
+        for token in tokens + [None]:
+            at = token.start() if token else len(content)
+            if not block_written and block_at <= at:
+                out.write(content[pos:block_at].encode('utf-8'))
+                # Before the first script after the slides, so Reveal and the components see blob: URLs
+                write_asset_block(assets, out)
+                pos, block_written = block_at, True
+            out.write(content[pos:at].encode('utf-8'))
+            if token is None:
+                break
+            pos = token.end()
+            kind = token.lastgroup
+            if kind == 'css' and local_file(token.group('css_href') or token.group('preload_href')):
+                attrs = ''.join(LINK_ATTR_RE.findall(token.group('css_attrs') or ''))  # e.g. id="theme"
+                out.write(f'<style{attrs}>\n'.encode('utf-8'))
+                copy_text(inlined[local_file(token.group('css_href') or token.group('preload_href'))], out)
+                out.write(b'\n</style>')
+            elif kind == 'js' and local_file(token.group('js_src')):
+                out.write(b'<script>\n')
+                copy_text(inlined[local_file(token.group('js_src'))], out)
+                out.write(b'\n</script>')
+            elif kind == 'media' and local_file(token.group('path')) in keys:
+                # Use sites carry data-bundle-<attr>="<content hash>"; the loader makes blob: URLs
+                out.write(f'data-bundle-{token.group("attr")}="{keys[local_file(token.group("path"))]}"'.encode('utf-8'))
+            elif kind == 'source' and local_srcset(token.group('srcset'), base_dir):
+                pass  # The <img> fallback is embedded; a <source> would point the browser off-file
+            elif kind != 'preload':  # Image preload hints are pointless once everything is inline
+                out.write(token.group(0).encode('utf-8'))
+        size = out.tell()
+    if compressed:
+        title = TITLE_RE.search(content)
+        shell = f"{output_file}.{os.getpid()}.shell.tmp"
+        with open(shell, 'wb') as out:
+            out.write((COMPRESSED_SHELL[0] % (title.group(0) if title else '')).encode('utf-8'))
+            write_gzip_base64(tmp, out)
+            out.write(COMPRESSED_SHELL[1].encode('utf-8'))
+            uncompressed, size = size, out.tell()
+        os.remove(tmp)
+        tmp = shell
+    os.replace(tmp, output_file)
 
     print(f"✅ Bundled presentation created at: {output_file}")
+    print(f"   {references} media reference(s) -> {len(assets)} unique asset(s): "
+          f"{_size(naive_size)} inlined per reference -> {_size(size)}")
+    if optimize:
+        print(f"   optimized: {reencoded} image(s) re-encoded, {len(inlined)} stylesheet(s)/script(s) minified"
+              + ("" if rcssmin and rjsmin else " (install rcssmin and rjsmin for full CSS/JS minification)"))
+    if compressed:
+        print(f"   compressed: {_size(uncompressed)} -> {_size(size)} (gzip, unpacked in the browser)")
+    if resolved.get('unconverted_fonts'):
+        print("   fontTools/brotli not installed: non-woff2 theme fonts were embedded as they are")
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
+    parser.add_argument("--optimize", action="store_true",
+                        help="Re-encode images at projector width and minify HTML/CSS/JS (for LINE or email)")
+    parser.add_argument("--compressed", action="store_true",
+                        help="Store the bundle as a gzip payload that unpacks itself in the browser")
     args = parser.parse_args()
 
-    bundle_html(args.input, args.output)
+    bundle_html(args.input, args.output, optimize=args.optimize, compressed=args.compressed)
@@ -0,0 +1,199 @@
+"""
+File placement and sync helpers shared by build.py, the deck generator and the deploy script.
+
+Stdlib only, so the skill scripts can use them without importing the build (and Pillow,
+fontTools, ...) at start-up. build.py imports the placement helpers it needs and points
+the on_* hooks at its --profile counters.
+"""
+
+import os
+import shutil
+import errno
+import hashlib
+from pathlib import Path
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# How asset bytes get from inputs/ into dist/ ('auto' tries them in this order)
+MATERIALIZE_STRATEGIES = ('reflink', 'hardlink', 'copy_file_range', 'sendfile', 'copy')
+FICLONE = 0x40049409  # Linux ioctl: share extents copy-on-write (btrfs, XFS, bcachefs)
+
+# Instrumentation hooks, no-ops unless build.py is profiling
+def on_read(num_bytes):
+    pass
+
+def on_output(path, size, physical=True):
+    pass
+
+def on_skip():
+    pass
+
+def file_digest(path):
+    """SHA-256 of a file's content, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            on_read(len(chunk))
+            h.update(chunk)
+    return h.hexdigest()
+
+def remove_empty_parents(directory, stop_at):
+    """Remove empty directories upwards until stop_at (exclusive)."""
+    directory, stop_at = Path(directory), Path(stop_at)
+    while directory != stop_at and stop_at in directory.parents:
+        try:
+            directory.rmdir()
+        except OSError:
+            return
+        directory = directory.parent
+
+# Mechanisms found unusable for a (strategy, src device, dst device) pair; avoids retrying per file
+_UNSUPPORTED = set()
+
+def _reflink(src, dst):
+    import fcntl
+    with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+        fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+    shutil.copystat(src, dst)
+
+def _hardlink(src, dst):
+    os.link(src, dst)
+
+def _copy_file_range(src, dst):
+    with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+        remaining = os.fstat(fs.fileno()).st_size
+        while remaining > 0:
+            sent = os.copy_file_range(fs.fileno(), fd.fileno(), remaining)
+            if sent == 0:
+                break
+            remaining -= sent
+    shutil.copystat(src, dst)
+
+def _sendfile(src, dst):
+    with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+        offset, size = 0, os.fstat(fs.fileno()).st_size
+        while offset < size:
+            sent = os.sendfile(fd.fileno(), fs.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    shutil.copystat(src, dst)
+
+def _buffered_copy(src, dst):
+    shutil.copy2(src, dst)
+
+_MATERIALIZERS = {
+    'reflink': _reflink,
+    'hardlink': _hardlink,
+    'copy_file_range': _copy_file_range,
+    'sendfile': _sendfile,
+    'copy': _buffered_copy,
+}
+
+def materialize(src, dst, strategy='auto'):
+    """
+    Place the content of src at dst as cheaply as the filesystem allows and return the
+    mechanism used. 'auto' tries reflink, hardlink, copy_file_range and sendfile before
+    falling back to a buffered copy; a named strategy still falls back to 'copy'.
+
+    dst is always replaced (never written through), so an existing hardlink to an input
+    can't be modified by a rebuild.
+    """
+    src, dst = Path(src), Path(dst)
+    candidates = MATERIALIZE_STRATEGIES if strategy == 'auto' else (strategy, 'copy')
+    try:
+        devices = (src.stat().st_dev, dst.parent.stat().st_dev)
+    except OSError:
+        devices = (None, None)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+
+    for method in candidates:
+        if (method, devices) in _UNSUPPORTED:
+            continue
+        try:
+            _MATERIALIZERS[method](src, tmp)
+        except (OSError, AttributeError, ImportError) as e:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            if method == 'copy' or (isinstance(e, OSError) and e.errno in (errno.ENOENT, errno.EACCES, errno.ENOSPC)):
+                raise
+            # Not supported here (EXDEV, EOPNOTSUPP, EINVAL, missing os function...): remember and fall through
+            _UNSUPPORTED.add((method, devices))
+            continue
+        os.replace(tmp, dst)
+        on_output(dst, dst.stat().st_size, physical=method not in ('hardlink', 'reflink'))
+        return method
+    raise OSError(f"No materialization strategy succeeded for {src}")
+
+def sync_file(src, dst, checksum=False, strategy='auto'):
+    """
+    Bring one file up to date: 'copied' if dst was missing, 'updated' if it differed,
+    'unchanged' if size and mtime match (with checksum=True: if the content hashes match).
+    """
+    src, dst = Path(src), Path(dst)
+    st = src.stat()
+    try:
+        dst_st = dst.stat()
+    except FileNotFoundError:
+        dst_st = None
+    if dst_st is not None:
+        if os.path.samestat(st, dst_st):
+            return 'unchanged'  # Already a hardlink to the source
+        if st.st_size == dst_st.st_size and (
+                file_digest(src) == file_digest(dst) if checksum else st.st_mtime_ns == dst_st.st_mtime_ns):
+            on_skip()
+            return 'unchanged'
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    materialize(src, dst, strategy)  # Every strategy keeps the source mtime for the next comparison
+    return 'copied' if dst_st is None else 'updated'
+
+def sync_tree(src, dst, ignore=None, delete=False, checksum=False, strategy='auto'):
+    """
+    rsync-like one-way sync of the src directory into dst: copy new files, replace changed
+    ones (see sync_file) and, with delete=True, remove files that are no longer in src.
+    ignore takes shutil.ignore_patterns-style callables; ignored names are neither copied
+    nor deleted. Returns {'copied': [...], 'updated': [...], 'deleted': [...],
+    'unchanged': count, 'bytes': bytes placed} with paths relative to dst.
+    """
+    src, dst = Path(src), Path(dst)
+    report = {"copied": [], "updated": [], "deleted": [], "unchanged": 0, "bytes": 0}
+    if not src.is_dir():
+        return report
+    wanted = set()
+    for dirpath, dirnames, filenames in os.walk(src):
+        skip = ignore(dirpath, dirnames + filenames) if ignore else set()
+        dirnames[:] = sorted(d for d in dirnames if d not in skip)
+        for name in sorted(filenames):
+            if name in skip:
+                continue
+            path = Path(dirpath) / name
+            rel = path.relative_to(src).as_posix()
+            wanted.add(rel)
+            status = sync_file(path, dst / rel, checksum, strategy)
+            if status == 'unchanged':
+                report["unchanged"] += 1
+            else:
+                report[status].append(rel)
+                report["bytes"] += path.stat().st_size
+
+    if delete and dst.is_dir():
+        stale = []
+        for dirpath, dirnames, filenames in os.walk(dst):
+            skip = ignore(dirpath, dirnames + filenames) if ignore else set()
+            dirnames[:] = [d for d in dirnames if d not in skip]
+            stale.extend(Path(dirpath) / name for name in filenames
+                         if name not in skip and (Path(dirpath) / name).relative_to(dst).as_posix() not in wanted)
+        for path in stale:
+            path.unlink()
+            report["deleted"].append(path.relative_to(dst).as_posix())
+            remove_empty_parents(path.parent, dst)
+    return report
+
+def format_sync_report(report):
+    parts = [f"{len(report[k])} {k}" for k in ("copied", "updated", "deleted") if report[k]]
+    parts.append(f"{report['unchanged']} unchanged")
+    if report["bytes"]:
+        parts.append(f"{report['bytes'] / (1024 * 1024):.1f} MB transferred")
+    return ", ".join(parts)
@@ -1,10 +1,113 @@
 import json
 import os
+import re
 import sys
+import glob
 import shutil
-from jinja2 import Environment, FileSystemLoader
+import argparse
+import contextlib
+import hashlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 
-def generate_presentation(json_path):
+# Shared file sync helpers (also used by build.py) sit next to this script. Appended, so
+# importing this module never shadows the importer's own modules.
+if os.path.dirname(os.path.abspath(__file__)) not in sys.path:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from file_sync import sync_file, sync_tree, format_sync_report
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+# Compiled templates persist here, so a cold start skips compiling base.html and the layouts
+BYTECODE_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'jinja')
+# Rendered slide fragments, one JSON file per deck: {cache key: html}
+SLIDE_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'slides')
+# Bump when the way a slide is rendered changes outside its layout template
+SLIDE_CACHE_VERSION = "1"
+
+# Lazy media: only the title slide, the next meta.preload_distance slides and slides with
+# "preload": true load their media up front; Reveal fills in data-src/data-background for
+# the rest as they come within viewDistance (= the same distance) of the current slide.
+DEFAULT_PRELOAD_DISTANCE = 3
+LAZY_SRC_RE = re.compile(r'(<(?:img|video|audio|iframe|source)(?=[\s/>])[^>]*?\s)src=', re.IGNORECASE)
+SECTION_OPEN_RE = re.compile(r'<section\b', re.IGNORECASE)
+BACKGROUND_IMAGE_RE = re.compile(r"""data-background(?:-image)?=(["'])((?:\./)?images/[^"']+)\1""")
+
+def create_environment(template_dir=TEMPLATE_DIR, cache_dir=BYTECODE_CACHE_DIR):
+    """Jinja environment for the deck templates; reuse it to skip re-parsing (build.py --watch)."""
+    bytecode_cache = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    return Environment(loader=FileSystemLoader(template_dir), bytecode_cache=bytecode_cache)
+
+def _sha(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def slide_cache_path(json_path, cache_dir=SLIDE_CACHE_DIR):
+    return os.path.join(cache_dir, _sha(os.path.abspath(json_path))[:16] + '.json')
+
+def render_slides(env, slides, meta, root_path, cache_file=None):
+    """
+    Render each slide through its layout template on its own, reusing fragments cached
+    under a hash of the slide dict, its layout template source, meta and root_path.
+    Returns (fragments in slide order, indexes of slides that were actually rendered).
+    The cache file is rewritten with only this deck's current fragments.
+    """
+    cache = {}
+    if cache_file:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+
+    template_hashes = {}
+    fragments, rendered, keep = [], [], {}
+    for index, slide in enumerate(slides):
+        name = slide['layout'] + '.html'
+        if name not in template_hashes:
+            template_hashes[name] = _sha(env.loader.get_source(env, name)[0])
+        key = _sha(json.dumps([SLIDE_CACHE_VERSION, template_hashes[name], slide, meta, root_path],
+                              sort_keys=True, default=str))
+        html = cache.get(key)
+        if html is None:
+            html = env.get_template(name).render(slide=slide, meta=meta, root_path=root_path)
+            rendered.append(index)
+        keep[key] = html
+        fragments.append(html)
+
+    if cache_file and (rendered or len(keep) != len(cache)):
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(keep, f)
+        os.replace(tmp, cache_file)
+    return fragments, rendered
+
+def preload_distance(meta):
+    try:
+        return max(1, int(meta.get('preload_distance', DEFAULT_PRELOAD_DISTANCE)))
+    except (TypeError, ValueError):
+        return DEFAULT_PRELOAD_DISTANCE
+
+def apply_media_loading(fragments, slides, distance):
+    """
+    Defer media on slides beyond the preload window (src= -> data-src=) and mark the
+    others with data-preload. Returns (fragments, background image URLs to preload).
+    """
+    out, preload = [], []
+    for index, (html, slide) in enumerate(zip(fragments, slides)):
+        if index <= distance or slide.get('preload'):
+            out.append(SECTION_OPEN_RE.sub('<section data-preload', html, count=1))
+            preload += [m.group(2) for m in BACKGROUND_IMAGE_RE.finditer(html) if m.group(2) not in preload]
+        else:
+            out.append(LAZY_SRC_RE.sub(r'\1data-src=', html))
+    return out, preload
+
+def generate_presentation(json_path, env=None, use_cache=True, prune_images=False):
     # 1. Load Configuration
     with open(json_path, 'r', encoding='utf-8') as f:
         config = json.load(f)
@@ -36,7 +139,8 @@ def generate_presentation(json_path):
     # These are hosted at the root level of the library for efficiency.
     
     # Use ignore function to skip GDrive system files and hidden files
-    ignore_func = shutil.ignore_patterns('desktop.ini', '.*', '.git', 'node_modules', 'test', 'examples', 'gulpfile.js', 'package.json')
+    # (ACT.png always comes from the project root, below)
+    ignore_func = shutil.ignore_patterns('desktop.ini', '.*', '.git', 'node_modules', 'test', 'examples', 'gulpfile.js', 'package.json', 'ACT.png')
 
     # 3.5 Copy Lesson Images (MANDATORY for published folder portability)
     images_src = os.path.join(lesson_dir, 'images')
@@ -45,14 +149,16 @@ def generate_presentation(json_path):
         os.makedirs(images_dst)
 
     if os.path.exists(images_src):
-        shutil.copytree(images_src, images_dst, ignore=ignore_func, dirs_exist_ok=True)
-        print(f"Synchronized images to: {images_dst}")
+        # Only new or changed images are placed (hardlink/reflink where possible);
+        # with prune_images, images deleted from the lesson leave published/ too
+        report = sync_tree(images_src, images_dst, ignore=ignore_func, delete=prune_images)
+        print(f"Synchronized images to: {images_dst} ({format_sync_report(report)})")
 
     # Copy ACT logo from project root
     act_logo_src = os.path.join(os.path.dirname(os.path.dirname(skill_dir)), 'images', 'ACT.png')
     if os.path.exists(act_logo_src):
-        shutil.copy2(act_logo_src, os.path.join(images_dst, 'ACT.png'))
-        print(f"Copied ACT logo to: {images_dst}")
+        if sync_file(act_logo_src, os.path.join(images_dst, 'ACT.png')) != 'unchanged':
+            print(f"Copied ACT logo to: {images_dst}")
 
     # 4. Copy Audio Assets
     project_root = os.path.dirname(os.path.dirname(skill_dir))
@@ -64,12 +170,11 @@ def generate_presentation(json_path):
     for item in ['blip.mp3', 'beep.mp3', 'bell.mp3', '30-seconds.mp3', 'warning.mp3']:
         src_file = os.path.join(audio_src, item)
         dst_file = os.path.join(audio_dst, item)
-        if os.path.exists(src_file) and not os.path.exists(dst_file):
-            shutil.copy2(src_file, dst_file)
+        if os.path.exists(src_file) and sync_file(src_file, dst_file) != 'unchanged':
             print(f"Copied {item} to: {audio_dst}")
 
     # 5. Render Template
-    env = Environment(loader=FileSystemLoader(template_dir))
+    env = env or create_environment(template_dir)
     template = env.get_template('base.html')
     # Pre-process slides for video URL construction
     for slide in config.get('slides', []):
@@ -95,11 +200,28 @@ def generate_presentation(json_path):
     # Presentations live at /[LESSON-NAME]/index.html
     root_path = "../"
 
+    # Slides render one by one (most from the fragment cache); base.html stitches them together
+    slides = config.get('slides', [])
+    meta = config.get('meta', {})
+    fragments, rendered = render_slides(env, slides, meta, root_path,
+                                        slide_cache_path(json_path) if use_cache else None)
+    distance = preload_distance(meta)
+    fragments, preload_images = apply_media_loading(fragments, slides, distance)
     output_html = template.render(
-        meta=config.get('meta', {}),
-        slides=config.get('slides', []),
-        root_path=root_path
+        meta=meta,
+        slides=slides,
+        root_path=root_path,
+        rendered_slides=fragments,
+        preload_distance=distance,
+        preload_images=preload_images
     )
+    if len(rendered) == len(slides):
+        print(f"Rendered all {len(slides)} slides.")
+    elif rendered:
+        print(f"Re-rendered {len(rendered)} of {len(slides)} slides: "
+              + ", ".join(f"#{i + 1} ({slides[i]['layout']})" for i in rendered))
+    else:
+        print(f"All {len(slides)} slides unchanged (from cache).")
 
     # 6. Save Output
     output_path = os.path.join(output_dir, 'index.html')
@@ -108,10 +230,69 @@ def generate_presentation(json_path):
         
     print(f"Presentation generated successfully at: {output_path}")
 
+# One environment per worker process, created by the pool initializer
+_worker_env = None
+
+def _init_worker():
+    global _worker_env
+    _worker_env = create_environment()
+
+def _render_one(json_path, env=None, use_cache=True, prune_images=False):
+    """Render one deck, capturing its log lines so parallel output stays readable."""
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            generate_presentation(json_path, env=env or _worker_env, use_cache=use_cache, prune_images=prune_images)
+        return json_path, None, out.getvalue()
+    except Exception as e:
+        return json_path, f"{type(e).__name__}: {e}", out.getvalue()
+
+def generate_many(json_paths, jobs=1, env=None, use_cache=True, prune_images=False):
+    """
+    Render several decks with shared Jinja environments: in this process when jobs is 1,
+    otherwise across a process pool (0 = one worker per CPU core).
+    Returns [(json_path, error or None, captured output)] in input order.
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(json_paths) <= 1:
+        env = env or create_environment()
+        return [_render_one(path, env, use_cache, prune_images) for path in json_paths]
+    n = len(json_paths)
+    with ProcessPoolExecutor(max_workers=min(jobs, n), initializer=_init_worker) as pool:
+        return list(pool.map(_render_one, json_paths, [None] * n, [use_cache] * n, [prune_images] * n))
+
+def find_all_decks(inputs_dir=os.path.join(PROJECT_ROOT, 'inputs')):
+    return sorted(glob.glob(os.path.join(inputs_dir, '*', 'presentation.json')))
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python generate_presentation.py <path_to_config.json>")
+    parser = argparse.ArgumentParser(description="Render presentation.json files into published/index.html")
+    parser.add_argument("json_paths", nargs="*", metavar="presentation.json", help="Decks to render")
+    parser.add_argument("--all", action="store_true", help="Render every inputs/*/presentation.json")
+    parser.add_argument("-j", "--jobs", type=int, nargs="?", const=0, default=1,
+                        help="Render in N worker processes (no value or 0 = one per CPU core)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-render every slide, ignoring cached fragments")
+    parser.add_argument("--prune-images", action="store_true",
+                        help="Delete images from published/images that no longer exist in the lesson's images/")
+    args = parser.parse_args()
+
+    json_paths = args.json_paths + (find_all_decks() if args.all else [])
+    if not json_paths:
+        parser.print_usage()
         sys.exit(1)
-    
-    json_path = sys.argv[1]
-    generate_presentation(json_path)
\ No newline at end of file
+
+    if len(json_paths) == 1:
+        generate_presentation(json_paths[0], use_cache=not args.no_cache, prune_images=args.prune_images)
+        sys.exit(0)
+
+    failed = 0
+    for json_path, error, output in generate_many(json_paths, args.jobs, use_cache=not args.no_cache,
+                                                     prune_images=args.prune_images):
+        deck = os.path.basename(os.path.dirname(json_path))
+        if error:
+            failed += 1
+            print(f"[ERROR] {deck}: {error}")
+        else:
+            print(f"[OK] {deck}")
+    print(f"Rendered {len(json_paths) - failed} of {len(json_paths)} decks.")
+    sys.exit(1 if failed else 0)
\ No newline at end of file
@@ -29,6 +29,22 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DIST_ROOT = PROJECT_ROOT / "dist"
 
+# Shared sync helpers live with the deck generator
+sys.path.insert(0, str(PROJECT_ROOT / "skills" / "creating-html-presentation" / "scripts"))
+from file_sync import sync_tree, format_sync_report
+
+# Content-addressed store shared by all decks (see build.py); names never change meaning
+ASSET_STORE = "_assets"
+# Immutable library files a deck can reference: the store (including responsive image
+# variants, <hash>-<width>.<fmt>, and named entries such as fa-icons.<hash>.css) and
+# fingerprinted engine/global files
+IMMUTABLE_REF_RE = re.compile(
+    r'\.\./(' + ASSET_STORE + r'/(?:[\w-]+\.)?[0-9a-f]+(?:-\d+)?\.[A-Za-z0-9]+'
+    r'|(?:dist|plugin|css|images|js)/[^"\'()?#<>]+\.[0-9a-f]{10}\.[A-Za-z0-9]+)'
+)
+# Files a stylesheet pulls in itself (e.g. the Font Awesome subset's woff2 fonts)
+CSS_REF_RE = re.compile(r'''(?:url\(\s*|@import\s+)["']?([^"')\s;]+)''')
+
 
 def run(cmd, cwd=None, check=True):
     """Run a shell command and return stdout."""
@@ -56,7 +72,7 @@ def verify_presentation_exists(folder_name):
 def generate_dashboard(worktree_path):
     """Generate dashboard index.html from folders in the worktree."""
     lessons = []
-    skip_dirs = {"dist", "plugin", "css", "images", ".git"}
+    skip_dirs = {"dist", "plugin", "css", "images", "js", ASSET_STORE, ".git"}
 
     for d in sorted(worktree_path.iterdir()):
         if d.is_dir() and d.name not in skip_dirs and not d.name.startswith("."):
@@ -144,6 +160,55 @@ def sync_shared_media(folder_name, worktree_path):
         print(f"[OK] Synced {copied} shared media file(s).")
 
 
+def immutable_refs(html, dist_root=DIST_ROOT):
+    """
+    Library paths (relative to dist/) a deck needs: its immutable refs plus, recursively,
+    the local files its stylesheets reference, which never appear in the deck HTML.
+    """
+    refs = set(IMMUTABLE_REF_RE.findall(html))
+    pending = [ref for ref in refs if ref.endswith(".css")]
+    while pending:
+        css = Path(pending.pop())
+        try:
+            text = (dist_root / css).read_text(encoding="utf-8")
+        except OSError:
+            continue
+        for target in CSS_REF_RE.findall(text):
+            if target.startswith(("data:", "#")) or "://" in target or target.startswith("//"):
+                continue
+            ref = os.path.normpath(css.parent / target.split("?")[0].split("#")[0]).replace(os.sep, "/")
+            if ref.startswith("..") or ref in refs or not (dist_root / ref).is_file():
+                continue
+            refs.add(ref)
+            if ref.endswith(".css"):
+                pending.append(ref)
+    return refs
+
+
+def sync_immutable_assets(folder_name, worktree_path):
+    """
+    Copy the content-hashed library files the presentation references (/_assets/ and
+    fingerprinted engine files) to gh-pages. Existing names are never overwritten, so
+    other presentations and the shared engine stay untouched.
+    """
+    refs = immutable_refs((DIST_ROOT / folder_name / "index.html").read_text(encoding="utf-8"))
+
+    copied = 0
+    for name in sorted(refs):
+        src = DIST_ROOT / name
+        dst = worktree_path / name
+        if dst.exists():
+            continue  # Content-addressed: an existing file is already the right one
+        if not src.exists():
+            print(f"  [!] WARNING: {name} referenced but not built locally")
+            continue
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dst)
+        copied += 1
+
+    print(f"[OK] Immutable library assets: {len(refs)} referenced, {copied} uploaded.")
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python deploy_presentation.py <FOLDER-NAME>")
@@ -183,15 +248,16 @@ def main():
     # Step 4: Copy the presentation folder (Self-contained)
     print(f"[4/5] Copying presentation: {folder_name}")
     dest = worktree_path / folder_name
-    if dest.exists():
-        shutil.rmtree(dest)
-    
-    # Ignore system files during copy
+
+    # Ignore system files and the local server's .gz/.br sidecars (GitHub Pages compresses on its own)
     def ignore_patterns(path, names):
-        return [n for n in names if n.lower() == 'desktop.ini' or n == '.DS_Store' or n == 'Thumbs.db']
+        return [n for n in names if n.lower() == 'desktop.ini' or n == '.DS_Store' or n == 'Thumbs.db'
+                or n.endswith(('.gz', '.br'))]
 
-    shutil.copytree(presentation_src, dest, ignore=ignore_patterns)
-    print(f"[OK] Copied to: {dest}")
+    # Checkout mtimes say nothing about content, so compare hashes; unchanged files stay untouched
+    report = sync_tree(presentation_src, dest, ignore=ignore_patterns, delete=True, checksum=True, strategy='copy')
+    print(f"[OK] Synced to: {dest} ({format_sync_report(report)})")
+    sync_immutable_assets(folder_name, worktree_path)
 
     # Step 5: Update dashboard
     print("[5/5] Regenerating dashboard...")
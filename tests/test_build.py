@@ -0,0 +1,169 @@
+"""
+The parts of build.py that can lose data: manifest bookkeeping (merge, forget, prune,
+reload), staging and swapping trees into dist/, and precompressed sidecar clean-up.
+"""
+
+import gzip
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DECK = "<!DOCTYPE html><html><head><title>{title}</title></head><body>{body}</body></html>"
+
+
+def load_build():
+    spec = importlib.util.spec_from_file_location("build", PROJECT_ROOT / "build.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+build = load_build()
+
+
+def make_manifest(tmp_path, outputs):
+    """A manifest of tmp_path/dist recording {dist path: text}, each from its own source file."""
+    dist = tmp_path / "dist"
+    manifest = build.BuildManifest(dist, project_root=tmp_path)
+    for key, text in outputs.items():
+        src = tmp_path / "src" / key
+        dst = dist / key
+        for path in (src, dst):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        manifest.record(src, dst)
+    return manifest
+
+
+def test_merge_lesson_replaces_only_that_lessons_entries(tmp_path):
+    manifest = make_manifest(tmp_path, {"a/index.html": "a", "a/old.png": "x", "b/index.html": "b"})
+    fresh = {"a/index.html": dict(manifest.entries["a/index.html"])}
+    manifest.merge_lesson("a", fresh, set(fresh))
+    assert sorted(manifest.entries) == ["a/index.html", "b/index.html"]
+
+
+def test_prune_removes_untouched_outputs_under_prefixes_only(tmp_path):
+    manifest = make_manifest(tmp_path, {"a/index.html": "a", "a/img/gone.png": "x", "b/index.html": "b"})
+    manifest.touched = {"a/index.html"}
+    assert manifest.prune(["a"]) == 1
+    dist = tmp_path / "dist"
+    assert not (dist / "a" / "img").exists()  # Emptied folders go too
+    assert (dist / "b" / "index.html").exists()
+    assert sorted(manifest.entries) == ["a/index.html", "b/index.html"]
+
+
+def test_forget_drops_only_the_target_lessons(tmp_path):
+    manifest = make_manifest(tmp_path, {"a/index.html": "a", "ab/index.html": "ab", "b/index.html": "b"})
+    manifest.incompressible = {"a/index.html": [], "b/index.html": []}
+    manifest.forget(["a"])
+    assert sorted(manifest.entries) == ["ab/index.html", "b/index.html"]
+    assert list(manifest.incompressible) == ["b/index.html"]
+
+
+def test_manifest_notices_a_newer_copy_on_disk(tmp_path):
+    manifest = make_manifest(tmp_path, {"a/index.html": "a"})
+    manifest.save()
+    assert not manifest.changed_on_disk()
+    other = build.BuildManifest(manifest.dist_root, project_root=tmp_path)
+    other.load()
+    other.entries["b/index.html"] = dict(other.entries["a/index.html"])
+    other.save()
+    os.utime(other.path, ns=(0, manifest.disk_state[0] + 1))  # Coarse clocks: force a different mtime
+    assert manifest.changed_on_disk()
+
+
+def test_swap_in_replaces_the_live_tree(tmp_path):
+    live, staged = tmp_path / "dist", tmp_path / ".dist-staging"
+    (live / "old").mkdir(parents=True)
+    (staged / "new").mkdir(parents=True)
+    old = build.swap_in(staged, live)
+    assert (live / "new").is_dir() and (Path(old) / "old").is_dir()
+
+
+def test_swap_in_restores_the_live_tree_when_the_second_rename_fails(tmp_path, monkeypatch):
+    live, staged = tmp_path / "dist", tmp_path / ".dist-staging"
+    (live / "old").mkdir(parents=True)
+    (staged / "new").mkdir(parents=True)
+    rename = os.rename
+
+    def locked(src, dst):
+        if Path(src) == staged:
+            raise PermissionError("locked")
+        rename(src, dst)
+
+    monkeypatch.setattr(build, "_rename_exchange", lambda a, b: False)
+    monkeypatch.setattr(build.os, "rename", locked)
+    with pytest.raises(PermissionError):
+        build.swap_in(staged, live)
+    assert (live / "old").is_dir()
+    assert not (tmp_path / ".dist-old").exists()
+
+
+def test_precompress_records_sidecars_that_do_not_pay(tmp_path):
+    root = tmp_path / "dist"
+    root.mkdir()
+    text = root / "deck.html"
+    text.write_text("<p>repetitive</p>" * 500, encoding="utf-8")
+    noise = root / "noise.json"
+    noise.write_bytes(os.urandom(4096))
+    manifest = build.BuildManifest(root, project_root=tmp_path)
+    build.precompress(root, manifest=manifest)
+    assert gzip.decompress((root / "deck.html.gz").read_bytes()) == text.read_bytes()
+    assert not (root / "noise.json.gz").exists()
+    assert ".gz" in manifest.incompressible["noise.json"][3]
+    assert build.precompress(root, manifest=manifest) == (0, 0)  # Nothing re-read or rewritten
+    noise.unlink()
+    build.precompress(root, manifest=manifest)
+    assert "noise.json" not in manifest.incompressible
+
+
+def test_precompress_removes_a_deleted_lessons_folder(tmp_path):
+    root = tmp_path / "dist"
+    lesson = root / "gone"
+    lesson.mkdir(parents=True)
+    (lesson / "index.html").write_text("<p>slide</p>" * 500, encoding="utf-8")
+    build.precompress(root)
+    (lesson / "index.html").unlink()  # What prune() does when the lesson's input is removed
+    build.precompress(root)
+    assert not lesson.exists()
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A throwaway project (the real engine and build.py) with two hand-written lessons."""
+    for name in ("build.py", "lib", "skills", "images", "js", "audio"):
+        (tmp_path / name).symlink_to(PROJECT_ROOT / name)
+    for lesson in ("one", "two"):
+        folder = tmp_path / "inputs" / lesson
+        folder.mkdir(parents=True)
+        (folder / "index.html").write_text(DECK.format(title=lesson, body="<p>slide</p>"), encoding="utf-8")
+    return tmp_path
+
+
+def run_build(project, *args):
+    return subprocess.run([sys.executable, "build.py", "--no-optimize-images", *args], cwd=project,
+                          check=True, capture_output=True, text=True)
+
+
+def test_targeted_force_build_keeps_other_lessons_in_the_manifest(project):
+    run_build(project)
+    manifest = project / "dist" / build.MANIFEST_NAME
+    before = json.loads(manifest.read_text(encoding="utf-8"))["entries"]
+    assert any(key.startswith("two/") for key in before)
+    run_build(project, "--force", "one")
+    after = json.loads(manifest.read_text(encoding="utf-8"))["entries"]
+    assert {k for k in before if k.startswith("two/")} <= set(after)
+    assert "matches" in run_build(project, "--verify").stdout
+
+
+def test_targeted_build_of_a_missing_lesson_leaves_dist_alone(project):
+    run_build(project)
+    run_build(project, "no-such-lesson")
+    assert not (project / "dist" / "no-such-lesson").exists()
+    assert (project / "dist" / "one" / "index.html").exists()
@@ -0,0 +1,75 @@
+"""
+The deploy script uploads only the immutable library files a deck references, so every
+library ref build.py writes into a deck must be picked up by IMMUTABLE_REF_RE.
+"""
+
+import importlib.util
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEPLOY_SCRIPT = PROJECT_ROOT / "skills" / "deploying-to-github-pages" / "scripts" / "deploy_presentation.py"
+ASSET_REF_RE = re.compile(r'''\.\./(_assets/[^"'()\s,]+)''')
+
+DECK = """<!DOCTYPE html><html><head><title>Deploy refs</title>
+<link rel="stylesheet" href="../dist/reveal.css">
+<link rel="stylesheet" href="../css/deck.css">
+<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
+</head><body><div class="reveal"><div class="slides">
+<section data-background="images/photo.png"><i class="fas fa-star"></i><img src="images/photo.png"></section>
+<section><img src="images/photo.png" data-src="images/photo.png"></section>
+</div></div><script src="../dist/reveal.js"></script></body></html>
+"""
+
+
+def load_deploy():
+    spec = importlib.util.spec_from_file_location("deploy_presentation", DEPLOY_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def built_deck(tmp_path_factory):
+    """dist/ of a throwaway project (the real engine, skills and build.py) holding one deck."""
+    Image = pytest.importorskip("PIL.Image")
+    root = tmp_path_factory.mktemp("project")
+    for name in ("build.py", "lib", "skills", "images", "js", "audio"):
+        (root / name).symlink_to(PROJECT_ROOT / name)
+    published = root / "inputs" / "demo" / "published"
+    (published / "images").mkdir(parents=True)
+    Image.new("RGB", (1400, 800), (139, 21, 56)).save(published / "images" / "photo.png")
+    (published / "index.html").write_text(DECK, encoding="utf-8")
+    subprocess.run([sys.executable, "build.py", "demo"], cwd=root, check=True, capture_output=True)
+    return root / "dist"
+
+
+def test_every_asset_store_ref_is_uploaded(built_deck):
+    html = (built_deck / "demo" / "index.html").read_text(encoding="utf-8")
+    refs = set(ASSET_REF_RE.findall(html))
+    assert any(re.search(r"-\d+\.(webp|avif)$", ref) for ref in refs), "fixture should produce responsive variants"
+    collected = set(load_deploy().IMMUTABLE_REF_RE.findall(html))
+    assert refs <= collected
+    for ref in refs:
+        assert (built_deck / ref).exists()
+
+
+def test_icon_stylesheet_and_its_fonts_are_uploaded(built_deck):
+    html = (built_deck / "demo" / "index.html").read_text(encoding="utf-8")
+    assert "cdnjs.cloudflare.com" not in html
+    refs = load_deploy().immutable_refs(html, built_deck)
+    icons = [ref for ref in refs if re.match(r"_assets/fa-icons\.[0-9a-f]+\.css$", ref)]
+    assert icons
+    fonts = re.findall(r"url\(([^)]+\.woff2)\)", (built_deck / icons[0]).read_text(encoding="utf-8"))
+    assert fonts
+    assert {f"_assets/{font}" for font in fonts} <= refs
+
+
+def test_fingerprinted_deck_stylesheet_is_uploaded(built_deck):
+    html = (built_deck / "demo" / "index.html").read_text(encoding="utf-8")
+    refs = load_deploy().immutable_refs(html, built_deck)
+    assert [ref for ref in refs if re.match(r"css/deck\.[0-9a-f]{10}\.css$", ref)]
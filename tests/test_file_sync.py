@@ -0,0 +1,59 @@
+"""sync_tree mirrors a folder into another one; with delete=True it must remove only what src no longer has."""
+
+import importlib.util
+import shutil
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+FILE_SYNC = PROJECT_ROOT / "skills" / "creating-html-presentation" / "scripts" / "file_sync.py"
+
+
+def load_file_sync():
+    spec = importlib.util.spec_from_file_location("file_sync", FILE_SYNC)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+file_sync = load_file_sync()
+
+
+def write(root, files):
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+def test_sync_tree_copies_updates_and_deletes(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    write(src, {"a.png": "a", "sub/b.png": "b"})
+    report = file_sync.sync_tree(src, dst, strategy="copy")  # A hardlink would see the edit below too
+    assert sorted(report["copied"]) == ["a.png", "sub/b.png"]
+
+    write(src, {"a.png": "a2"})
+    (src / "sub" / "b.png").unlink()
+    report = file_sync.sync_tree(src, dst, delete=True, strategy="copy")
+    assert report["updated"] == ["a.png"]
+    assert report["deleted"] == ["sub/b.png"]
+    assert (dst / "a.png").read_text(encoding="utf-8") == "a2"
+    assert not (dst / "sub").exists()
+
+
+def test_sync_tree_keeps_ignored_files_and_everything_without_delete(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    write(src, {"a.png": "a"})
+    write(dst, {"ACT.png": "logo", "extra.png": "x"})
+    file_sync.sync_tree(src, dst)
+    assert (dst / "extra.png").exists()
+    report = file_sync.sync_tree(src, dst, ignore=shutil.ignore_patterns("ACT.png"), delete=True)
+    assert report["deleted"] == ["extra.png"]
+    assert (dst / "ACT.png").exists()
+    assert report["unchanged"] == 1
+
+
+def test_sync_tree_of_a_missing_source_deletes_nothing(tmp_path):
+    dst = tmp_path / "dst"
+    write(dst, {"a.png": "a"})
+    report = file_sync.sync_tree(tmp_path / "missing", dst, delete=True)
+    assert report["deleted"] == [] and (dst / "a.png").exists()